@@ -1,3 +1,52 @@
-from .db_utils import get_data_from_db
-from .compressor import prepare_and_store_compressor_objects
-from .full_export import export_full_refrigeration_system_to_json
\ No newline at end of file
+import importlib
+
+# Public API -> submodule defining it. Submodules are imported on first attribute
+# access (PEP 562), so `import refrigeration` stays cheap for short-lived worker
+# processes that only need one exporter.
+_LAZY_ATTRIBUTES = {
+    "BuildingUnit": "building_unit",
+    "SuperMarketSystem": "building_unit",
+    "get_data_from_db": "db_utils",
+    "get_data_from_counts": "db_utils",
+    "assign_racks_to_cases_and_walkins": "rack_assignment",
+    "IncrementalRackAssignment": "rack_assignment",
+    "calculate_compressors_for_racks": "compressor",
+    "prepare_and_store_compressor_objects": "compressor",
+    "prepare_and_store_condenser_objects": "condenser",
+    "prepare_and_store_case_and_walkin_objects": "case_walkin_objects",
+    "generate_system_and_casewalkin_lists": "system_objects",
+    "export_all_refrigeration_json": "json_io",
+    "export_full_refrigeration_system_to_json": "full_export",
+    "export_sharded_refrigeration_system_to_json": "full_export",
+    "run_batch": "batch_runner",
+    "run_monte_carlo": "monte_carlo",
+    "simulate_head_pressure": "head_pressure",
+    "calculate_corrected_case_loads": "case_performance",
+    "optimize_store": "optimizer",
+    "optimize_portfolio": "optimizer",
+}
+
+_SUBMODULES = (
+    "batch_runner", "building_unit", "case_performance", "case_walkin_objects", "catalog_snapshot",
+    "compressor", "condenser", "curve_fitting", "db_utils", "full_export", "head_pressure",
+    "import_budget", "json_io", "mode_selection", "monte_carlo", "optimizer", "rack_assignment",
+    "refrigerant", "results_store", "streaming", "system_objects", "utils",
+)
+
+__all__ = sorted(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(f".{_LAZY_ATTRIBUTES[name]}", __name__), name)
+    elif name in _SUBMODULES:
+        value = importlib.import_module(f".{name}", __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # Cache so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__) | set(_SUBMODULES))
@@ -0,0 +1,248 @@
+import json
+import os
+import sqlite3
+import time
+import traceback
+from .building_unit import BuildingUnit, SuperMarketSystem
+from .db_utils import find_missing_units
+from .rack_assignment import assign_racks_to_cases_and_walkins
+from .compressor import calculate_compressors_for_racks, load_and_print_compressor_curves, generate_compressor_objects
+from .condenser import generate_condenser_objects
+from .case_walkin_objects import generate_case_objects_from_data, generate_walkin_objects_from_data
+from .system_objects import generate_system_and_casewalkin_lists
+from .json_io import export_all_refrigeration_json
+from .results_store import write_run_results
+
+MANIFEST_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scenario_runs (
+    scenario_id TEXT PRIMARY KEY,
+    scenario_json TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    output_path TEXT,
+    error TEXT,
+    started_at REAL,
+    finished_at REAL,
+    elapsed_seconds REAL
+);
+CREATE INDEX IF NOT EXISTS idx_scenario_runs_status ON scenario_runs (status);
+"""
+
+
+def load_scenarios(path):
+    """Load scenarios from a JSON list file or a JSON Lines file."""
+    with open(path) as f:
+        if path.endswith(".jsonl"):
+            return [json.loads(line) for line in f if line.strip()]
+        return json.load(f)
+
+
+def build_scenario_units(scenario, db_path):
+    """
+    Turn a scenario dict into (case_units, walkin_units, template).
+
+    A scenario lists its units as {"name", "number_of_units"} dicts under
+    "cases" and "walkins" (names without the template prefix, as in user
+    mode). A scenario without units loads the SuperMarket defaults of its
+    template, as in automated mode.
+    """
+    template = scenario["template"].lower()
+    if not scenario.get("cases") and not scenario.get("walkins"):
+        system = SuperMarketSystem(template, db_path)
+        system.load_defaults()
+        return system.cases, system.walkins, template
+
+    def to_units(entries):
+        return [
+            BuildingUnit("User", f"{template} {entry['name']}", "Category", entry.get("number_of_units", 1), template=template, user_mode=True)
+            for entry in entries
+        ]
+
+    return to_units(scenario.get("cases", [])), to_units(scenario.get("walkins", [])), template
+
+
+def run_scenario(scenario, db_path, output_dir, results_db_path=None):
+    """
+    Run the full generation pipeline for one scenario and export its JSON files.
+
+    When `results_db_path` is given, the scenario's racks, compressor
+    assignments, condensers and system objects are also appended to that
+    results store (see `results_store.py`).
+
+    Raises:
+        ValueError: If a unit the scenario lists is not in the catalog, so the
+        scenario fails (and is retried, then quarantined) instead of exporting
+        a partial store. Scenarios on the SuperMarket defaults are not checked,
+        as the defaults name units missing from every template's catalog.
+
+    Returns:
+        str: Directory holding the scenario's JSON files.
+    """
+    selected_case_units, selected_walkin_units, template = build_scenario_units(scenario, db_path)
+
+    mt_racks, lt_racks, case_data, walkin_data = assign_racks_to_cases_and_walkins(db_path, selected_case_units, selected_walkin_units)
+    if scenario.get("cases") or scenario.get("walkins"):
+        missing = find_missing_units(
+            [u.case_name for u in selected_case_units] + [u.walkin_name for u in selected_walkin_units],
+            case_data, walkin_data
+        )
+        if missing:
+            raise ValueError(f"Units not found in the {template} catalog: {', '.join(missing)}")
+    mt_info = calculate_compressors_for_racks(mt_racks, "MT", template)
+    lt_info = calculate_compressors_for_racks(lt_racks, "LT", template)
+
+    mt_power_curve, mt_capacity_curve, lt_power_curve, lt_capacity_curve = load_and_print_compressor_curves(db_path, template, verbose=False)
+    mt_condensers, mt_curves = generate_condenser_objects(mt_info, "MT", template)
+    lt_condensers, lt_curves = generate_condenser_objects(lt_info, "LT", template)
+    system_objects = generate_system_and_casewalkin_lists(selected_case_units, selected_walkin_units, mt_racks, lt_racks, template)
+
+    scenario_dir = os.path.join(output_dir, str(scenario["scenario_id"]))
+    os.makedirs(scenario_dir, exist_ok=True)
+    export_all_refrigeration_json(
+        mt_compressors=generate_compressor_objects(mt_info, template, "MT", curve_json=mt_power_curve),
+        lt_compressors=generate_compressor_objects(lt_info, template, "LT", curve_json=lt_power_curve),
+        mt_power_curve=mt_power_curve,
+        mt_capacity_curve=mt_capacity_curve,
+        lt_power_curve=lt_power_curve,
+        lt_capacity_curve=lt_capacity_curve,
+        mt_condensers=mt_condensers,
+        lt_condensers=lt_condensers,
+        mt_curves=mt_curves,
+        lt_curves=lt_curves,
+        case_objects=generate_case_objects_from_data(case_data, selected_case_units),
+        walkin_objects=generate_walkin_objects_from_data(walkin_data, selected_walkin_units),
+        system_and_casewalkin_objects=system_objects,
+        output_paths={key: os.path.join(scenario_dir, name) for key, name in {
+            "cases_and_walkins": "All_Cases_Walkins.json",
+            "compressors": "All_Compressors.json",
+            "condensers": "All_Condensers.json",
+            "system_and_casewalkin_lists": "System_and_CaseWalkin_Lists.json",
+            "full": "Full_Refrigeration_System.json"
+        }.items()},
+        verbose=False
+    )
+
+    # Only record results once the export succeeded, so a retried scenario is stored once
+    if results_db_path:
+        write_run_results(
+            results_db_path, scenario["scenario_id"], template,
+            mt_racks, lt_racks, mt_info, lt_info,
+            condensers=mt_condensers + lt_condensers,
+            system_objects=system_objects
+        )
+    return scenario_dir
+
+
+def _format_duration(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:d}:{minutes:02d}:{seconds:02d}"
+
+
+def run_batch(
+    scenarios,
+    db_path,
+    output_dir="batch_output",
+    manifest_path=None,
+    max_attempts=3,
+    run_fn=run_scenario,
+    retry_quarantined=False,
+    results_db_path=None
+):
+    """
+    Run many scenarios with a durable, resumable SQLite manifest.
+
+    Every scenario's status, attempts, output path and last error are kept in
+    the `scenario_runs` table of the manifest DB. Re-running with the same
+    manifest skips completed and quarantined scenarios and picks up the rest,
+    including scenarios left 'running' by a preempted job. A failing scenario
+    is retried until it has used `max_attempts` attempts in total, then
+    quarantined so it no longer blocks the batch. An interrupted attempt
+    counts as used, so a scenario preempted on its last attempt is
+    quarantined on resume.
+
+    Args:
+        scenarios (list): Scenario dicts, each with a unique "scenario_id".
+        db_path (str): Path to the SQLite catalog DB.
+        output_dir (str): Root directory for scenario outputs.
+        manifest_path (str): Manifest DB path (defaults to `<output_dir>/batch_manifest.db`).
+        max_attempts (int): Attempts per scenario before quarantine.
+        run_fn (callable): run_fn(scenario, db_path, output_dir) -> output path.
+        retry_quarantined (bool): Give quarantined scenarios a fresh set of attempts.
+        results_db_path (str): Optional results store passed on to run_fn.
+
+    Returns:
+        dict: Number of scenarios per final status.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_path = manifest_path or os.path.join(output_dir, "batch_manifest.db")
+
+    conn = sqlite3.connect(manifest_path)
+    conn.executescript(MANIFEST_SCHEMA)
+    with conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO scenario_runs (scenario_id, scenario_json) VALUES (?, ?)",
+            [(str(s["scenario_id"]), json.dumps(s)) for s in scenarios]
+        )
+
+    if retry_quarantined:
+        with conn:
+            conn.execute("UPDATE scenario_runs SET status = 'pending', attempts = 0 WHERE status = 'quarantined'")
+
+    status_by_id = dict(conn.execute("SELECT scenario_id, status FROM scenario_runs"))
+    todo = [s for s in scenarios if status_by_id[str(s["scenario_id"])] not in ("completed", "quarantined")]
+    print(f"▶️ {len(scenarios) - len(todo)} of {len(scenarios)} scenarios already done, {len(todo)} to run.")
+
+    batch_start = time.perf_counter()
+    for done, scenario in enumerate(todo, 1):
+        scenario_id = str(scenario["scenario_id"])
+        attempts = conn.execute("SELECT attempts FROM scenario_runs WHERE scenario_id = ?", (scenario_id,)).fetchone()[0]
+
+        while attempts < max_attempts:
+            attempts += 1
+            started_at = time.time()
+            with conn:
+                conn.execute(
+                    "UPDATE scenario_runs SET status = 'running', attempts = ?, started_at = ?, finished_at = NULL WHERE scenario_id = ?",
+                    (attempts, started_at, scenario_id)
+                )
+            try:
+                if results_db_path:
+                    output_path = run_fn(scenario, db_path, output_dir, results_db_path=results_db_path)
+                else:
+                    output_path = run_fn(scenario, db_path, output_dir)
+            except Exception:
+                status = "quarantined" if attempts >= max_attempts else "failed"
+                with conn:
+                    conn.execute(
+                        "UPDATE scenario_runs SET status = ?, error = ?, finished_at = ?, elapsed_seconds = ? WHERE scenario_id = ?",
+                        (status, traceback.format_exc(), time.time(), time.time() - started_at, scenario_id)
+                    )
+                continue
+
+            with conn:
+                conn.execute(
+                    "UPDATE scenario_runs SET status = 'completed', output_path = ?, error = NULL, finished_at = ?, elapsed_seconds = ? WHERE scenario_id = ?",
+                    (output_path, time.time(), time.time() - started_at, scenario_id)
+                )
+            break
+
+        # Out of attempts without completing: a final attempt interrupted while
+        # 'running', or 'failed' rows after max_attempts was lowered
+        with conn:
+            conn.execute(
+                "UPDATE scenario_runs SET status = 'quarantined' WHERE scenario_id = ? AND status != 'completed'",
+                (scenario_id,)
+            )
+
+        status = conn.execute("SELECT status FROM scenario_runs WHERE scenario_id = ?", (scenario_id,)).fetchone()[0]
+        elapsed = time.perf_counter() - batch_start
+        throughput = done / elapsed if elapsed > 0 else 0.0
+        eta = (len(todo) - done) / throughput if throughput else 0.0
+        icon = "✅" if status == "completed" else "❌"
+        print(f"[{done}/{len(todo)}] {icon} {scenario_id} ({status}) — {throughput:.2f} scenarios/s, ETA {_format_duration(eta)}")
+
+    counts = dict(conn.execute("SELECT status, COUNT(*) FROM scenario_runs GROUP BY status"))
+    conn.close()
+    print(f"🏁 Batch finished: {counts}")
+    return counts
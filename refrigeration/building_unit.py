@@ -1,4 +1,4 @@
-import sqlite3
+from .catalog_snapshot import load_catalog_snapshot, select_catalog_rows
 
 class BuildingUnit:
     def __init__(self, building_type, base_name, category, number_of_units=None, template=None, user_mode=False, zone_name=None):
@@ -34,6 +34,21 @@ class SuperMarketSystem:
         self.walkins = []
 
     def load_defaults(self):
+        snapshot = load_catalog_snapshot(self.db_path)
+        if snapshot is not None:
+            rows = select_catalog_rows(snapshot, "building_category_mapping", building_type="SuperMarket", template=self.system_type)
+            self.cases = [
+                BuildingUnit(self.building_type, row["base_name"], row["category"], row["number_of_units"], self.system_type)
+                for row in rows if row["system_type"] == "case"
+            ]
+            self.walkins = [
+                BuildingUnit(self.building_type, row["base_name"], row["category"], template=self.system_type)
+                for row in rows if row["system_type"] == "walkin"
+            ]
+            return
+
+        import sqlite3  # only the fallback without a catalog snapshot needs the DB
+
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
 
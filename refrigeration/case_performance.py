@@ -0,0 +1,199 @@
+import math
+
+# Rated ambient conditions of display cases (ASHRAE 72: 23.9 °C / 55 % RH)
+RATED_ZONE_TEMPERATURE = 23.9
+RATED_ZONE_RH = 55.0
+
+
+def dewpoint_temperature(temperatures, relative_humidities):
+    """Dewpoint (°C) from dry-bulb (°C) and relative humidity (%) sequences (Magnus formula)."""
+    a, b = 17.62, 243.12
+    dewpoints = []
+    for t, rh in zip(temperatures, relative_humidities):
+        gamma = math.log(max(rh, 0.1) / 100) + a * t / (b + t)
+        dewpoints.append(b * gamma / (a - gamma))
+    return dewpoints
+
+
+RATED_ZONE_DEWPOINT = dewpoint_temperature([RATED_ZONE_TEMPERATURE], [RATED_ZONE_RH])[0]
+
+
+def _cubic_curve(name, c1, c2, c3, c4=0.0, min_x=-10.0, max_x=25.0):
+    return {
+        "type": "OS:Curve:Cubic",
+        "name": name,
+        "Coefficient1Constant": c1,
+        "Coefficient2x": c2,
+        "Coefficient3x2": c3,
+        "Coefficient4x3": c4,
+        "MinimumValueofx": min_x,
+        "MaximumValueofx": max_x
+    }
+
+
+def _normalized_at(curve, x):
+    """Scale a cubic curve's coefficients so that it equals 1.0 at x."""
+    value = curve["Coefficient1Constant"] + x * (curve["Coefficient2x"] + x * (curve["Coefficient3x2"] + x * curve["Coefficient4x3"]))
+    for key in ("Coefficient1Constant", "Coefficient2x", "Coefficient3x2", "Coefficient4x3"):
+        curve[key] /= value
+    return curve
+
+
+# Default correction curves named in refrigeration_cases (DewpointMethod, x = zone dewpoint °C).
+# The DB stores only the curve names; these representative curves are normalized to 1.0 at
+# RATED_ZONE_DEWPOINT (~14.3 °C) so rated conditions give rated loads. Individual curves can be
+# overridden by passing `curves=` to the functions below.
+DEFAULT_CASE_CURVES = {
+    curve["name"]: _normalized_at(curve, RATED_ZONE_DEWPOINT) for curve in (
+        _cubic_curve("Open Latent Curve", 0.294976, 0.02592, 0.0016),
+        _cubic_curve("Glass Door Latent Curve", 0.456832, 0.02044, 0.0012),
+        _cubic_curve("Coffin Latent Curve", 0.405568, 0.02256, 0.0013),
+        _cubic_curve("Coffin Defrost Curve", 0.517888, 0.02196, 0.0008),
+        _cubic_curve("Glass Door Defrost Curve", 0.569152, 0.01984, 0.0007),
+    )
+}
+
+
+def evaluate_cubic(curve, xs):
+    """Evaluate an OS:Curve:Cubic over a sequence, clamping x to the curve's valid range."""
+    c1, c2, c3, c4 = (curve["Coefficient1Constant"], curve["Coefficient2x"], curve["Coefficient3x2"], curve["Coefficient4x3"])
+    lo, hi = curve["MinimumValueofx"], curve["MaximumValueofx"]
+    results = []
+    for x in xs:
+        x = min(max(x, lo), hi)
+        results.append(c1 + x * (c2 + x * (c3 + x * c4)))
+    return results
+
+
+def _correction_multipliers(curve_type, curve_name, case_temp, zone_rhs, zone_dewpoints, curves):
+    """
+    Hourly multipliers of a latent case credit or defrost energy correction curve.
+
+    CaseTemperatureMethod: 1 - (RH_rated - RH_zone) * curve(T_case)
+    RelativeHumidityMethod: curve(RH_zone)
+    DewpointMethod: curve(T_dewpoint,zone)
+    """
+    if not curve_type or curve_type == "None" or not curve_name:
+        return [1.0] * len(zone_dewpoints)
+    if curve_name not in curves:
+        raise ValueError(f"Correction curve not found: {curve_name}")
+    curve = curves[curve_name]
+
+    if curve_type == "DewpointMethod":
+        values = evaluate_cubic(curve, zone_dewpoints)
+    elif curve_type == "RelativeHumidityMethod":
+        values = evaluate_cubic(curve, zone_rhs)
+    elif curve_type == "CaseTemperatureMethod":
+        slope = evaluate_cubic(curve, [case_temp])[0]
+        values = [1 - (RATED_ZONE_RH - rh) * slope for rh in zone_rhs]
+    else:
+        raise ValueError(f"Invalid correction curve type: {curve_type}")
+    return [max(0.0, v) for v in values]
+
+
+def anti_sweat_heater_power(case, zone_rhs, zone_dewpoints, minimum_power_fraction=0.0):
+    """
+    Hourly anti-sweat heater power (W per m of case) for the case's control type.
+
+    None: 0; Constant: rated power;
+    Linear: rated * (1 - (RH_rated - RH_zone) * (1 - min/rated) / RH_rated);
+    DewpointMethod: rated * (T_dp,zone - T_case) / (T_dp,rated - T_case).
+    Linear and DewpointMethod are floored at `minimum_power_fraction` * rated.
+    """
+    control = case.get("anti_sweat_heater_control_type") or "None"
+    rated = case.get("anti_sweat_power") or 0.0
+    minimum = rated * minimum_power_fraction
+
+    if control == "None" or rated == 0:
+        return [0.0] * len(zone_dewpoints)
+    elif control == "Constant":
+        return [rated] * len(zone_dewpoints)
+    elif control == "Linear":
+        return [max(minimum, rated * (1 - (RATED_ZONE_RH - rh) * (1 - minimum_power_fraction) / RATED_ZONE_RH)) for rh in zone_rhs]
+    elif control == "DewpointMethod":
+        case_temp = case["case_operating_temperature"]
+        return [max(minimum, rated * (dp - case_temp) / (RATED_ZONE_DEWPOINT - case_temp)) for dp in zone_dewpoints]
+    raise ValueError(f"Unsupported anti-sweat heater control type: {control}")
+
+
+def calculate_corrected_case_loads(case_data, zone_temperatures, zone_humidities, curves=None, minimum_anti_sweat_fraction=0.0):
+    """
+    Off-rated hourly loads for every case in case_data.
+
+    Follows the EnergyPlus refrigerated case model: the latent part of the
+    rated capacity is scaled by the latent case credit curve, and the change
+    in anti-sweat heater power from its rated value is added in proportion to
+    the fraction of heater energy that goes to the case. The defrost energy
+    correction curve scales defrost power for temperature-terminated defrost.
+    Defrost schedules are not applied, so defrost_power is the power while
+    defrosting.
+
+    Args:
+        case_data (dict): Case data from `get_data_from_db`.
+        zone_temperatures (list): Hourly zone dry-bulb temperature (°C).
+        zone_humidities (list): Hourly zone relative humidity (%).
+        curves (dict): Curve dicts by name, merged over DEFAULT_CASE_CURVES so only overrides are needed.
+        minimum_anti_sweat_fraction (float): Minimum heater power for Linear/DewpointMethod control.
+
+    Returns:
+        dict: {case_name: {"total_load", "sensible_load", "latent_load",
+        "anti_sweat_power", "defrost_power"}} with hourly lists in W for the
+        case's total length (unit_length * unit_count).
+    """
+    curves = {**DEFAULT_CASE_CURVES, **(curves or {})}
+    zone_rhs = list(zone_humidities)
+    zone_dewpoints = dewpoint_temperature(zone_temperatures, zone_rhs)
+
+    loads = {}
+    for case_name, case in case_data.items():
+        length = case["unit_length"] * case.get("unit_count", 1)
+        rated_load = case["rated_capacity"] * length * (case.get("rated_runtime_fraction") or 1.0)
+        lhr = float(case.get("rated_latent_heat_ratio") or 0.0)
+        ash_fraction = case.get("fraction_of_anti_sweat_heater_energy_to_cases") or 0.0
+        rated_ash = (case.get("anti_sweat_power") or 0.0) * length
+
+        latent_mult = _correction_multipliers(
+            case.get("latent_case_credit_curve_type"), case.get("latent_case_credit_curve_name"),
+            case["case_operating_temperature"], zone_rhs, zone_dewpoints, curves
+        )
+        ash_power = [p * length for p in anti_sweat_heater_power(case, zone_rhs, zone_dewpoints, minimum_anti_sweat_fraction)]
+
+        if "TemperatureTermination" in (case.get("defrost_type") or ""):
+            defrost_mult = _correction_multipliers(
+                case.get("defrost_energy_correction_curve_type"), case.get("defrost_energy_correction_curve_name"),
+                case["case_operating_temperature"], zone_rhs, zone_dewpoints, curves
+            )
+        else:
+            defrost_mult = [1.0] * len(zone_dewpoints)
+        defrost_power = (case.get("defrost_power") or 0.0) * length
+
+        sensible = rated_load * (1 - lhr)
+        latent_load = [rated_load * lhr * m for m in latent_mult]
+        sensible_load = [sensible + ash_fraction * (p - rated_ash) for p in ash_power]
+        loads[case_name] = {
+            "total_load": [s + l for s, l in zip(sensible_load, latent_load)],
+            "sensible_load": sensible_load,
+            "latent_load": latent_load,
+            "anti_sweat_power": ash_power,
+            "defrost_power": [defrost_power * m for m in defrost_mult]
+        }
+    return loads
+
+
+def calculate_corrected_rack_loads(racks, case_loads, n_hours):
+    """
+    Hourly rack loads (W) from corrected case loads.
+
+    Units without corrected loads (e.g. walk-ins) contribute their rated
+    rack capacity every hour.
+    """
+    rack_loads = []
+    for rack in racks:
+        hourly = [0.0] * n_hours
+        for item in rack:
+            if item['name'] in case_loads:
+                hourly = [h + v for h, v in zip(hourly, case_loads[item['name']]["total_load"])]
+            else:
+                hourly = [h + item['capacity'] for h in hourly]
+        rack_loads.append(hourly)
+    return rack_loads
@@ -6,8 +6,12 @@ def generate_case_objects_from_data(case_data, selected_case_units):
 
     objects = []
     for case_name, info in case_data.items():
-        osm_name = name_to_osm.get(case_name, case_name)
-        zone_name = name_to_zone.get(case_name, "MainSales")
+        # Chunks split off by assign_racks_multi_constraint are named after their source unit
+        source_name = info.get("split_from", case_name)
+        osm_name = name_to_osm.get(source_name, source_name)
+        if "split_from" in info:
+            osm_name = f"{osm_name} {info['split_suffix']}"
+        zone_name = name_to_zone.get(source_name, "MainSales")
 
         obj = {
             "type": "OS:Refrigeration:Case",
@@ -35,8 +39,12 @@ def generate_walkin_objects_from_data(walkin_data, selected_walkin_units):
 
     objects = []
     for walkin_name, info in walkin_data.items():
-        osm_name = name_to_osm.get(walkin_name, walkin_name)
-        zone_name = name_to_zone.get(walkin_name, "ActiveStorage")
+        # Chunks split off by assign_racks_multi_constraint are named after their source unit
+        source_name = info.get("split_from", walkin_name)
+        osm_name = name_to_osm.get(source_name, source_name)
+        if "split_from" in info:
+            osm_name = f"{osm_name} {info['split_suffix']}"
+        zone_name = name_to_zone.get(source_name, "ActiveStorage")
 
         obj = {
             "type": "OS:Refrigeration:WalkIn",
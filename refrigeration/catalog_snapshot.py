@@ -0,0 +1,267 @@
+import os
+import struct
+import sys
+
+# Bump whenever the on-disk layout below changes; older snapshots are then ignored.
+SNAPSHOT_FORMAT_VERSION = 2
+SNAPSHOT_SUFFIX = ".snapshot"
+
+# Layout (little-endian), plain data only so loading a snapshot never executes code:
+#   header   magic, format version, DB mtime_ns, DB size, DB SHA-256, string count, table count
+#   strings  one uint32 byte length per string, then the UTF-8 bytes of all strings
+#   tables   name index, column count, row count, column name indexes,
+#            one type code per cell, one 8-byte value per cell (int64, float64 or string index)
+SNAPSHOT_MAGIC = b"RFCATSNP"
+_HEADER = struct.Struct("<8sIqq32sII")
+_TABLE_HEADER = struct.Struct("<III")
+_NULL, _INT, _FLOAT, _TEXT = 0, 1, 2, 3
+
+# Per-process cache so repeated lookups reuse the already loaded snapshot
+_SNAPSHOT_CACHE = {}
+
+
+def get_snapshot_path(db_path):
+    """Return the default snapshot location, next to the SQLite DB."""
+    return f"{db_path}{SNAPSHOT_SUFFIX}"
+
+
+def compute_db_hash(db_path):
+    """Return the SHA-256 content hash of the SQLite DB file."""
+    import hashlib  # only needed when the (mtime, size) pre-check fails
+
+    digest = hashlib.sha256()
+    with open(db_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def build_catalog_snapshot(db_path, snapshot_path=None):
+    """
+    Compile every catalog table of the SQLite DB into a binary snapshot.
+
+    Rows are stored in rowid order, so lookups against the snapshot return
+    the same row that `cursor.fetchone()` would. Cells are typed 8-byte
+    values; text cells index a string table that holds each distinct string
+    once. The snapshot records the DB's SHA-256 and its (mtime, size), which
+    readers check first so an unchanged DB is not re-hashed.
+
+    Args:
+        db_path (str): Path to the SQLite DB.
+        snapshot_path (str): Output path (defaults to `<db_path>.snapshot`).
+
+    Returns:
+        str: Path of the written snapshot.
+    """
+    import sqlite3
+
+    snapshot_path = snapshot_path or get_snapshot_path(db_path)
+    db_stat = os.stat(db_path)
+    source_hash = compute_db_hash(db_path)
+
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY name")
+    table_names = [row[0] for row in cursor.fetchall()]
+
+    strings = {}
+
+    def string_index(value):
+        return strings.setdefault(value, len(strings))
+
+    table_blocks = []
+    for table in table_names:
+        cursor.execute(f'SELECT * FROM "{table}" ORDER BY rowid')
+        columns = [col[0] for col in cursor.description]
+        rows = cursor.fetchall()
+        types = bytearray()
+        values = bytearray()
+        for row in rows:
+            for value in row:
+                if value is None:
+                    types.append(_NULL)
+                    values += struct.pack("<q", 0)
+                elif isinstance(value, int):
+                    types.append(_INT)
+                    values += struct.pack("<q", value)
+                elif isinstance(value, float):
+                    types.append(_FLOAT)
+                    values += struct.pack("<d", value)
+                elif isinstance(value, str):
+                    types.append(_TEXT)
+                    values += struct.pack("<q", string_index(value))
+                else:
+                    raise ValueError(f"Unsupported value of type {type(value).__name__} in table {table}")
+        table_blocks.append(
+            _TABLE_HEADER.pack(string_index(table), len(columns), len(rows))
+            + struct.pack(f"<{len(columns)}I", *(string_index(col) for col in columns))
+            + bytes(types)
+            + bytes(values)
+        )
+    conn.close()
+
+    encoded = [value.encode("utf-8") for value in strings]
+    data = (
+        _HEADER.pack(
+            SNAPSHOT_MAGIC, SNAPSHOT_FORMAT_VERSION, db_stat.st_mtime_ns, db_stat.st_size,
+            bytes.fromhex(source_hash), len(encoded), len(table_blocks)
+        )
+        + struct.pack(f"<{len(encoded)}I", *(len(value) for value in encoded))
+        + b"".join(encoded)
+        + b"".join(table_blocks)
+    )
+
+    # Write to a temporary file first so concurrent readers never see a partial snapshot
+    tmp_path = f"{snapshot_path}.tmp{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, snapshot_path)
+
+    print(f"✅ Catalog snapshot ({len(table_names)} tables, {len(encoded)} strings) saved to: {snapshot_path}")
+    return snapshot_path
+
+
+def _decode_snapshot(data):
+    """
+    Parse snapshot bytes into {"format_version", "source_hash", "db_state", "tables"}.
+
+    Returns None for another format version; raises struct.error, ValueError
+    or IndexError for a truncated or corrupt file.
+    """
+    magic, version, db_mtime_ns, db_size, digest, n_strings, n_tables = _HEADER.unpack_from(data, 0)
+    if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_FORMAT_VERSION:
+        return None
+    offset = _HEADER.size
+
+    lengths = struct.unpack_from(f"<{n_strings}I", data, offset)
+    offset += 4 * n_strings
+    strings = []
+    for length in lengths:
+        strings.append(sys.intern(data[offset:offset + length].decode("utf-8")))
+        offset += length
+    if offset > len(data):
+        raise ValueError("Truncated snapshot string table")
+
+    tables = {}
+    for _ in range(n_tables):
+        name, n_cols, n_rows = _TABLE_HEADER.unpack_from(data, offset)
+        offset += _TABLE_HEADER.size
+        columns = tuple(strings[i] for i in struct.unpack_from(f"<{n_cols}I", data, offset))
+        offset += 4 * n_cols
+        n_cells = n_cols * n_rows
+        types = data[offset:offset + n_cells]
+        offset += n_cells
+        # Each 8-byte value read both ways; the type code picks the right one
+        ints = struct.unpack_from(f"<{n_cells}q", data, offset)
+        floats = struct.unpack_from(f"<{n_cells}d", data, offset)
+        offset += 8 * n_cells
+        cells = [
+            None if t == _NULL else ints[i] if t == _INT else floats[i] if t == _FLOAT else strings[ints[i]]
+            for i, t in enumerate(types)
+        ]
+        tables[strings[name]] = {
+            "columns": columns,
+            "rows": [tuple(cells[r * n_cols:(r + 1) * n_cols]) for r in range(n_rows)],
+        }
+
+    return {
+        "format_version": version,
+        "source_hash": digest.hex(),
+        "db_state": (db_mtime_ns, db_size),
+        "tables": tables,
+    }
+
+
+def _file_state(path):
+    """(mtime_ns, size) of a file, or None when it does not exist."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def load_catalog_snapshot(db_path, snapshot_path=None):
+    """
+    Load the binary catalog snapshot for a DB, if it exists and is up to date.
+
+    A snapshot whose recorded DB (mtime, size) matches the DB file is trusted
+    as is; otherwise the DB is re-hashed and compared with the recorded
+    content hash. The result is cached per process and revalidated whenever
+    the DB or snapshot file's modification time or size changes.
+
+    Args:
+        db_path (str): Path to the SQLite DB the snapshot was compiled from.
+        snapshot_path (str): Snapshot path (defaults to `<db_path>.snapshot`).
+
+    Returns:
+        dict or None: The snapshot, or None when it is missing, unreadable,
+        from another format version, or its content hash no longer matches the DB.
+    """
+    snapshot_path = snapshot_path or get_snapshot_path(db_path)
+    cache_key = (os.path.abspath(db_path), os.path.abspath(snapshot_path))
+    file_state = (_file_state(db_path), _file_state(snapshot_path))
+    cached = _SNAPSHOT_CACHE.get(cache_key)
+    if cached is not None and cached[0] == file_state:
+        return cached[1]
+
+    snapshot = None
+    if file_state[0] is not None and file_state[1] is not None:
+        try:
+            with open(snapshot_path, "rb") as f:
+                candidate = _decode_snapshot(f.read())
+        except (OSError, struct.error, ValueError, IndexError):
+            candidate = None
+        if candidate is not None and (
+            candidate["db_state"] == file_state[0]
+            or candidate["source_hash"] == compute_db_hash(db_path)
+        ):
+            snapshot = candidate
+            snapshot["_indexes"] = {}
+
+    _SNAPSHOT_CACHE[cache_key] = (file_state, snapshot)
+    return snapshot
+
+
+def clear_snapshot_cache():
+    """Forget snapshots loaded in this process (e.g. after rebuilding one)."""
+    _SNAPSHOT_CACHE.clear()
+
+
+def get_catalog_index(snapshot, table, key_column):
+    """
+    Return a {lower(key): row_dict} index for a snapshot table.
+
+    Only the first row per key is kept, matching `fetchone()` on the DB.
+    """
+    cache_key = (table, key_column)
+    index = snapshot["_indexes"].get(cache_key)
+    if index is None:
+        columns = snapshot["tables"][table]["columns"]
+        key_pos = columns.index(key_column)
+        index = {}
+        for row in snapshot["tables"][table]["rows"]:
+            if row[key_pos] is not None:
+                index.setdefault(row[key_pos].lower(), dict(zip(columns, row)))
+        snapshot["_indexes"][cache_key] = index
+    return index
+
+
+def select_catalog_rows(snapshot, table, **criteria):
+    """Return all rows (as dicts) of a snapshot table whose columns equal the given values."""
+    columns = snapshot["tables"][table]["columns"]
+    positions = [(columns.index(column), value) for column, value in criteria.items()]
+    return [
+        dict(zip(columns, row))
+        for row in snapshot["tables"][table]["rows"]
+        if all(row[pos] == value for pos, value in positions)
+    ]
+
+
+if __name__ == "__main__":
+    # Build step: python -m refrigeration.catalog_snapshot [db_path] [snapshot_path]
+    args = sys.argv[1:]
+    build_catalog_snapshot(
+        args[0] if args else "database/openstudio_refrigeration_system.db",
+        args[1] if len(args) > 1 else None,
+    )
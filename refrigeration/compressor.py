@@ -1,8 +1,10 @@
 
-import sqlite3, json
+import json
 from .utils import get_suction_temp
+from .catalog_snapshot import load_catalog_snapshot, select_catalog_rows
+from .refrigerant import get_capacity_ratio
 
-def generate_compressor_objects(compressor_info, template, operation_type, curve_json=None):
+def generate_compressor_objects(compressor_info, template, operation_type, curve_json=None, refrigerant=None):
     """
     Generate RefrigerationCompressor OpenStudio JSON objects including performance curve and suction temp.
 
@@ -11,13 +13,14 @@ def generate_compressor_objects(compressor_info, template, operation_type, curve
         template (str): 'old', 'new', or 'advanced'
         operation_type (str): 'MT' or 'LT'
         curve_json (dict): Performance curve JSON (optional)
+        refrigerant (str): Refrigerant for capacity and SST (optional, R404A specs if None)
 
     Returns:
         List[dict]: List of RefrigerationCompressor JSON objects
     """
     compressor_objects = []
-    capacity_w, power_w, cop, eer = get_compressor_specs(template, operation_type)
-    suction_temp = get_suction_temp(template, operation_type)  
+    capacity_w, power_w, cop, eer = get_compressor_specs(template, operation_type, refrigerant)
+    suction_temp = get_suction_temp(template, operation_type, refrigerant)
     curve_name = curve_json.get("name") if curve_json else None
 
     for rack in compressor_info:
@@ -42,21 +45,33 @@ def generate_compressor_objects(compressor_info, template, operation_type, curve
 
     return compressor_objects
 
-def get_compressor_specs(template, operation_type):
-    """Return compressor specs: capacity (W), power (W), COP, EER."""
+def get_compressor_specs(template, operation_type, refrigerant=None):
+    """
+    Return compressor specs: capacity (W), power (W), COP, EER.
+
+    Specs are rated for R404A. For another refrigerant, capacity and power are
+    scaled by its volumetric capacity relative to R404A at the design SST
+    (same displacement and COP).
+    """
     if operation_type == "MT":
         if template == "old":
-            return 52733.94, 24945, 2.12, 7.22
+            specs = 52733.94, 24945, 2.12, 7.22
         else:
-            return 38099.93, 15448, 2.47, 8.42
+            specs = 38099.93, 15448, 2.47, 8.42
     elif operation_type == "LT":
         if template == "old":
-            return 20038.77, 13963, 1.44, 4.90
+            specs = 20038.77, 13963, 1.44, 4.90
         else:
-            return 17181.96, 9766, 1.76, 6.00
+            specs = 17181.96, 9766, 1.76, 6.00
     else:
         raise ValueError(f"Unknown operation type: {operation_type}")
 
+    if refrigerant:
+        ratio = get_capacity_ratio(refrigerant, get_suction_temp(template, operation_type))
+        capacity, power, cop, eer = specs
+        specs = round(capacity * ratio, 2), round(power * ratio, 2), cop, eer
+    return specs
+
 def summarize_compressor_assignment(mt_racks, lt_racks, selected_template):
     """
     Calculate and display compressor assignment and specs based on rack loads and template.
@@ -90,26 +105,40 @@ def summarize_compressor_assignment(mt_racks, lt_racks, selected_template):
 
     return mt_info, lt_info
 
+CURVE_COLUMNS = (
+    "curve_name", "coefficient1", "coefficient2", "coefficient3", "coefficient4",
+    "coefficient5", "coefficient6", "coefficient7", "coefficient8", "coefficient9", "coefficient10",
+    "min_val_x", "max_val_x", "min_val_y", "max_val_y"
+)
+
 def get_compressor_curve(db_path, template, operation_type, curve_type=None):
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    
-    query = """
-    SELECT curve_name, coefficient1, coefficient2, coefficient3, coefficient4, 
-           coefficient5, coefficient6, coefficient7, coefficient8, coefficient9, coefficient10,
-           min_val_x, max_val_x, min_val_y, max_val_y
-    FROM refrigeration_compressors
-    WHERE template = ? AND operation_type = ?
-    """
-    params = [template, operation_type]
+    snapshot = load_catalog_snapshot(db_path)
+    if snapshot is not None:
+        criteria = {"template": template, "operation_type": operation_type}
+        if curve_type:
+            criteria["curve_type"] = curve_type
+        matches = select_catalog_rows(snapshot, "refrigeration_compressors", **criteria)
+        row = tuple(matches[0][col] for col in CURVE_COLUMNS) if matches else None
+    else:
+        import sqlite3  # only the fallback without a catalog snapshot needs the DB
+
+        conn = sqlite3.connect(db_path)
+        cursor = conn.cursor()
+
+        query = f"""
+        SELECT {", ".join(CURVE_COLUMNS)}
+        FROM refrigeration_compressors
+        WHERE template = ? AND operation_type = ?
+        """
+        params = [template, operation_type]
 
-    if curve_type:
-        query += " AND curve_type = ?"
-        params.append(curve_type)
+        if curve_type:
+            query += " AND curve_type = ?"
+            params.append(curve_type)
 
-    cursor.execute(query, params)
-    row = cursor.fetchone()
-    conn.close()
+        cursor.execute(query, params)
+        row = cursor.fetchone()
+        conn.close()
 
     if not row:
         return None
@@ -160,8 +189,8 @@ def load_and_print_compressor_curves(db_path, selected_template, verbose=True):
     return mt_power_curve, mt_capacity_curve, lt_power_curve, lt_capacity_curve
 
     
-def calculate_compressors_for_racks(racks, rack_type, template, redundancy=True):
-    capacity, _, _, _ = get_compressor_specs(template, rack_type)
+def calculate_compressors_for_racks(racks, rack_type, template, redundancy=True, refrigerant=None):
+    capacity, _, _, _ = get_compressor_specs(template, rack_type, refrigerant)
 
     compressors_per_rack = []
     for i, rack in enumerate(racks, 1):
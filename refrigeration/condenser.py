@@ -1,5 +1,19 @@
 from .utils import get_min_condensing_temp
-def generate_condenser_objects(rack_info, operation_type, template):
+
+def get_heat_rejection_factor(operation_type):
+    """Return heat rejected per W of rack load, 1 + 1/COP (COP 2.0 for MT, 1.3 for LT)."""
+    if operation_type == "LT":
+        return 1 + 1 / 1.3
+    elif operation_type == "MT":
+        return 1 + 1 / 2.0
+    else:
+        raise ValueError("Invalid operation type. Must be 'MT' or 'LT'.")
+
+def get_condenser_capacity(rack_load, operation_type):
+    """Return the rated heat rejection (W) of the condenser serving a rack load (W)."""
+    return round(1.2 * rack_load * get_heat_rejection_factor(operation_type),2)
+
+def generate_condenser_objects(rack_info, operation_type, template, refrigerant=None):
     """
     Generate OS:Refrigeration:Condenser:AirCooled objects and corresponding performance curves
     for each rack based on the rack load and operation type (MT or LT).
@@ -8,6 +22,7 @@ def generate_condenser_objects(rack_info, operation_type, template):
         rack_info (list): List of dicts with rack_number and rack_load
         operation_type (str): 'MT' or 'LT'
         template (str): 'old', 'new', or 'advanced'
+        refrigerant (str): Refrigerant for the minimum condensing temperature (optional)
 
     Returns:
         Tuple[List[dict], List[dict]]: condensers, curves
@@ -15,19 +30,14 @@ def generate_condenser_objects(rack_info, operation_type, template):
     condensers = []
     curves = []
 
-    min_cond_temp = get_min_condensing_temp(template, operation_type)
+    min_cond_temp = get_min_condensing_temp(template, operation_type, refrigerant)
 
     for rack in rack_info:
         rack_num = rack['rack_number']
         load = rack['rack_load']
 
         # Condenser capacity 
-        if operation_type == "LT":
-            cond_capacity = round(1.2 * load * (1 + 1 / 1.3),2)
-        elif operation_type == "MT":
-            cond_capacity = round(1.2 * load * (1 + 1 / 2.0),2)
-        else:
-            raise ValueError("Invalid operation type. Must be 'MT' or 'LT'.")
+        cond_capacity = get_condenser_capacity(load, operation_type)
 
         fan_power = round(0.0441 * cond_capacity + 695,2)
         condenser_name = f"{operation_type}_Rack{rack_num}_Condenser"
@@ -0,0 +1,251 @@
+import csv
+import math
+import re
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from .catalog_snapshot import clear_snapshot_cache
+
+# Term order of coefficient1..coefficient10 (EnergyPlus Curve:Bicubic, see database/README.md)
+BICUBIC_TERMS = ("1", "x", "x2", "y", "y2", "xy", "x3", "y3", "x2y", "xy2")
+
+
+def bicubic_terms(x, y):
+    """Return the ten bicubic basis terms for one (x, y) point."""
+    return (1.0, x, x * x, y, y * y, x * y, x ** 3, y ** 3, x * x * y, x * y * y)
+
+
+def evaluate_bicubic(coefficients, xs, ys):
+    """Evaluate a bicubic curve (coefficient1..coefficient10) over paired x and y sequences."""
+    c1, c2, c3, c4, c5, c6, c7, c8, c9, c10 = coefficients
+    return [
+        c1 + c2 * x + c3 * x * x + c4 * y + c5 * y * y + c6 * x * y
+        + c7 * x ** 3 + c8 * y ** 3 + c9 * x * x * y + c10 * x * y * y
+        for x, y in zip(xs, ys)
+    ]
+
+
+def bicubic_coefficients(curve):
+    """Return coefficient1..coefficient10 of an OS:Curve:Bicubic dict (e.g. from `get_compressor_curve`)."""
+    keys = sorted((k for k in curve if k.startswith("Coefficient")), key=lambda k: int(re.match(r"Coefficient(\d+)", k).group(1)))
+    return [curve[k] for k in keys]
+
+
+def _factor_design(xs, ys):
+    """
+    Column-scaled modified Gram-Schmidt QR of the bicubic design matrix.
+
+    QR keeps the conditioning of A (the normal equations would square it),
+    which matters for the strongly correlated x, x^2, x^3 columns.
+
+    Returns:
+        Tuple[list, list, list]: (q columns, r, column scales)
+    """
+    columns = [list(col) for col in zip(*(bicubic_terms(x, y) for x, y in zip(xs, ys)))]
+    k = len(columns)
+    scales = [math.sqrt(sum(v * v for v in col)) or 1.0 for col in columns]
+    q = [[v / s for v in col] for col, s in zip(columns, scales)]
+    r = [[0.0] * k for _ in range(k)]
+
+    for j in range(k):
+        v = q[j]
+        # Second pass re-orthogonalizes to recover precision lost in the first
+        for _ in range(2):
+            for i in range(j):
+                dot = sum(a * b for a, b in zip(q[i], v))
+                r[i][j] += dot
+                v = [a - dot * b for a, b in zip(v, q[i])]
+        norm = math.sqrt(sum(a * a for a in v))
+        if norm < 1e-10:
+            raise ValueError("Performance table does not span the bicubic terms (need a grid of SST and SCT values).")
+        r[j][j] = norm
+        q[j] = [a / norm for a in v]
+
+    return q, r, scales
+
+
+def _solve_factored(factor, targets):
+    """Least-squares coefficients for one target vector, reusing a design factorization."""
+    q, r, scales = factor
+    k = len(q)
+    qtb = [sum(a * b for a, b in zip(q[j], targets)) for j in range(k)]
+    coefficients = [0.0] * k
+    for j in reversed(range(k)):
+        coefficients[j] = (qtb[j] - sum(r[j][i] * coefficients[i] for i in range(j + 1, k))) / r[j][j]
+    return [c / s for c, s in zip(coefficients, scales)]
+
+
+def fit_bicubic_curve(xs, ys, values, factor=None):
+    """
+    Fit OS:Curve:Bicubic coefficients to tabulated points.
+
+    Args:
+        xs (list): Saturated suction temperatures (°C).
+        ys (list): Saturated condensing temperatures (°C).
+        values (list): Power (W) or capacity (W) at each point.
+        factor (tuple): Precomputed `_factor_design(xs, ys)`, shared between
+            curves tabulated on the same (x, y) points.
+
+    Returns:
+        dict: coefficients, valid x/y ranges and fit errors (rmse, max_abs_error, cv_rmse).
+    """
+    if len(values) < len(BICUBIC_TERMS):
+        raise ValueError(f"At least {len(BICUBIC_TERMS)} points are needed to fit a bicubic curve, got {len(values)}.")
+
+    coefficients = _solve_factored(factor or _factor_design(xs, ys), list(values))
+
+    residuals = [fit - value for fit, value in zip(evaluate_bicubic(coefficients, xs, ys), values)]
+    rmse = math.sqrt(sum(e * e for e in residuals) / len(residuals))
+    mean_value = sum(values) / len(values)
+
+    return {
+        "coefficients": coefficients,
+        "min_val_x": min(xs),
+        "max_val_x": max(xs),
+        "min_val_y": min(ys),
+        "max_val_y": max(ys),
+        "rmse": rmse,
+        "max_abs_error": max(abs(e) for e in residuals),
+        "cv_rmse": rmse / abs(mean_value) if mean_value else None,
+        "n_points": len(values)
+    }
+
+
+def load_performance_table_csv(path):
+    """
+    Read a manufacturer performance table.
+
+    Expected columns: model, template, operation_type, sst, sct, power, capacity
+    (temperatures in °C, power and capacity in W).
+    """
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            yield {
+                "model": row["model"],
+                "template": row["template"],
+                "operation_type": row["operation_type"],
+                "sst": float(row["sst"]),
+                "sct": float(row["sct"]),
+                "power": float(row["power"]),
+                "capacity": float(row["capacity"])
+            }
+
+
+def _fit_models(models):
+    """
+    Fit the power and capacity curves of a batch of compressor models.
+
+    Vendor tables are usually rated on the same SST/SCT grid, so the design
+    matrix is factored once per distinct grid and reused for every curve on it.
+    A model that cannot be fitted (too few points, degenerate grid) yields
+    entries with an "error" instead of coefficients; the other models are
+    still fitted.
+    """
+    factors = {}
+    fits = []
+    for (model, template, operation_type), points in models:
+        xs = [p["sst"] for p in points]
+        ys = [p["sct"] for p in points]
+        grid = tuple(zip(xs, ys))
+
+        for curve_type, suffix in (("power", "Pwr"), ("capacity", "Cap")):
+            try:
+                if grid not in factors and len(points) >= len(BICUBIC_TERMS):
+                    factors[grid] = _factor_design(xs, ys)
+                fit = fit_bicubic_curve(xs, ys, [p[curve_type] for p in points], factor=factors.get(grid))
+            except ValueError as e:
+                fit = {"error": str(e), "n_points": len(points)}
+            fit.update({
+                "curve_name": f"{model}_{suffix}_Curve",
+                "model": model,
+                "template": template,
+                "operation_type": operation_type,
+                "curve_type": curve_type
+            })
+            fits.append(fit)
+    return fits
+
+
+def fit_compressor_models(performance_rows, max_workers=None, batch_size=500):
+    """
+    Fit power and capacity curves for every compressor model in a performance table.
+
+    Args:
+        performance_rows (iterable): dicts with model, template, operation_type,
+            sst, sct, power and capacity (see `load_performance_table_csv`).
+        max_workers (int): Process pool size (None or 1 fits in-process).
+        batch_size (int): Models per batch sent to a worker.
+
+    Returns:
+        List[dict]: One fit per model and curve type (see `fit_bicubic_curve`),
+        with curve_name, template, operation_type and curve_type added. Curves
+        that could not be fitted carry an "error" message instead of coefficients.
+    """
+    models = {}
+    for row in performance_rows:
+        models.setdefault((row["model"], row["template"], row["operation_type"]), []).append(row)
+
+    items = list(models.items())
+    batches = [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+    if max_workers and max_workers > 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(_fit_models, batches))
+    else:
+        results = [_fit_models(batch) for batch in batches]
+
+    return [fit for batch_fits in results for fit in batch_fits]
+
+
+def insert_compressor_curves(db_path, fits, replace=True):
+    """
+    Bulk-insert fitted curves into `refrigeration_compressors` in one transaction.
+
+    Args:
+        db_path (str): Path to the SQLite DB.
+        fits (list): Output of `fit_compressor_models` (failed fits are skipped).
+        replace (bool): Delete existing rows with the same curve_name first.
+
+    Returns:
+        int: Number of inserted curves.
+    """
+    rows = [
+        (fit["curve_name"], fit["template"], fit["operation_type"], fit["curve_type"],
+         *fit["coefficients"],
+         fit["min_val_x"], fit["max_val_x"], fit["min_val_y"], fit["max_val_y"])
+        for fit in fits if "error" not in fit
+    ]
+
+    conn = sqlite3.connect(db_path)
+    try:
+        with conn:
+            if replace:
+                conn.executemany("DELETE FROM refrigeration_compressors WHERE curve_name = ?", [(row[0],) for row in rows])
+            conn.executemany("""
+                INSERT INTO refrigeration_compressors (
+                    curve_name, template, operation_type, curve_type,
+                    coefficient1, coefficient2, coefficient3, coefficient4, coefficient5,
+                    coefficient6, coefficient7, coefficient8, coefficient9, coefficient10,
+                    min_val_x, max_val_x, min_val_y, max_val_y
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, rows)
+    finally:
+        conn.close()
+
+    # The DB no longer matches any snapshot loaded in this process
+    clear_snapshot_cache()
+    print(f"✅ {len(rows)} compressor curves inserted into: {db_path}")
+    return len(rows)
+
+
+def display_fit_report(fits):
+    """Print fit error and valid range of each fitted curve."""
+    print("\n📈 Compressor Curve Fit Report:")
+    for fit in fits:
+        if "error" in fit:
+            print(f"❌ {fit['curve_name']}: not fitted ({fit['n_points']} points) → {fit['error']}")
+            continue
+        cv = f"{fit['cv_rmse'] * 100:.2f}%" if fit["cv_rmse"] is not None else "n/a"
+        print(
+            f"{fit['curve_name']}: RMSE = {fit['rmse']:.2f} W (CV {cv}), "
+            f"Max Error = {fit['max_abs_error']:.2f} W, "
+            f"x = [{fit['min_val_x']}, {fit['max_val_x']}] °C, y = [{fit['min_val_y']}, {fit['max_val_y']}] °C"
+        )
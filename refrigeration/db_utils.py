@@ -1,9 +1,37 @@
-import sqlite3
+from .catalog_snapshot import load_catalog_snapshot, get_catalog_index
+
+# Columns loaded for each selected case / walk-in
+CASE_COLUMNS = (
+    "case_name", "template", "operation_type",
+    "rated_capacity", "unit_length", "case_operating_temperature",
+    "evaporator_temperature", "fan_power", "lighting_power",
+    "defrost_type", "defrost_power", "defrost_schedules", "drip_down_schedules",
+    "case_lighting_schedules", "fraction_of_lighting_energy_to_case",
+    "anti_sweat_power", "anti_sweat_heater_control_type",
+    "fraction_of_anti_sweat_heater_energy_to_cases",
+    "rated_latent_heat_ratio", "rated_runtime_fraction",
+    "latent_case_credit_curve_type", "latent_case_credit_curve_name",
+    "defrost_energy_correction_curve_type", "defrost_energy_correction_curve_name",
+    "HVAC_return_air_fraction", "restocking_schedule", "case_credit_fraction_schedule",
+)
+
+WALKIN_COLUMNS = (
+    "walkin_name", "template", "operation_type",
+    "rated_capacity", "operating_temperature", "rated_cooling_source_temperature",
+    "rated_cooling_fan_power", "lighting_power", "lighting_schedule",
+    "defrost_type", "defrost_control_type", "defrost_schedule", "drip_down_schedule",
+    "stocking_door_u", "area_of_stocking_doors_facing_zone", "stocking_door_schedule",
+    "reachin_door_uvalue", "area_of_glass_reachin_doors_facing_zone",
+)
+
 
 def get_data_from_db(db_path, selected_case_units, selected_walkin_units):
     """
     Load case and walk-in data from the database using selected units.
 
+    When an up-to-date catalog snapshot (see `catalog_snapshot.py`) exists next
+    to the DB, rows are read from it instead of querying SQLite.
+
     Args:
         db_path (str): Path to the SQLite DB.
         selected_case_units (list): List of CaseUnit objects (with .case_name and .number_of_units).
@@ -12,68 +40,100 @@ def get_data_from_db(db_path, selected_case_units, selected_walkin_units):
     Returns:
         Tuple[dict, dict]: (case_data, walkin_data)
     """
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-
-    case_data = {}
-    walkin_data = {}
-
-    # CASES ---------------------------------
     case_counts = {}
     for unit in selected_case_units:
         key = unit.case_name.lower()
         case_counts[key] = case_counts.get(key, 0) + unit.number_of_units
 
-    for case_name, count in case_counts.items():
-        cursor.execute("""            
-            SELECT 
-                case_name, template, operation_type,
-                rated_capacity, unit_length, case_operating_temperature,
-                evaporator_temperature, fan_power, lighting_power,
-                defrost_type, defrost_schedules, drip_down_schedules,
-                case_lighting_schedules, fraction_of_lighting_energy_to_case,
-                anti_sweat_power, anti_sweat_heater_control_type,
-                fraction_of_anti_sweat_heater_energy_to_cases,
-                rated_latent_heat_ratio, rated_runtime_fraction,
-                latent_case_credit_curve_type, latent_case_credit_curve_name,
-                defrost_energy_correction_curve_type, defrost_energy_correction_curve_name,
-                HVAC_return_air_fraction, restocking_schedule, case_credit_fraction_schedule
-            FROM refrigeration_cases 
-            WHERE lower(case_name) = ?
-            """, (case_name,))
-        row = cursor.fetchone()
-        if row:
-            columns = [col[0] for col in cursor.description]
-            row_dict = dict(zip(columns, row))
-            row_dict["unit_count"] = count
-            row_dict["total_rated_capacity"] = row_dict["rated_capacity"] * row_dict["unit_length"] * count
-            case_data[row[0]] = row_dict
-
-    # WALK-INS -------------------------------
     walkin_counts = {}
     for unit in selected_walkin_units:
         key = unit.walkin_name.lower()
         walkin_counts[key] = walkin_counts.get(key, 0) + unit.number_of_units
 
+    return get_data_from_counts(db_path, case_counts, walkin_counts)
+
+
+def get_data_from_counts(db_path, case_counts, walkin_counts):
+    """
+    Load case and walk-in data for already aggregated unit counts.
+
+    Args:
+        db_path (str): Path to the SQLite DB.
+        case_counts (dict): {lowercase case name: number of units}
+        walkin_counts (dict): {lowercase walk-in name: number of units}
+
+    Returns:
+        Tuple[dict, dict]: (case_data, walkin_data)
+    """
+    snapshot = load_catalog_snapshot(db_path)
+    if snapshot is not None:
+        case_index = get_catalog_index(snapshot, "refrigeration_cases", "case_name")
+        walkin_index = get_catalog_index(snapshot, "refrigeration_walkins", "walkin_name")
+
+        def fetch_case(case_name):
+            row = case_index.get(case_name)
+            return {col: row[col] for col in CASE_COLUMNS} if row else None
+
+        def fetch_walkin(walkin_name):
+            row = walkin_index.get(walkin_name)
+            return {col: row[col] for col in WALKIN_COLUMNS} if row else None
+    else:
+        import sqlite3  # only the fallback without a catalog snapshot needs the DB
+
+        conn = sqlite3.connect(db_path)
+        cursor = conn.cursor()
+
+        def fetch_row(table, name_column, columns, name):
+            cursor.execute(
+                f"SELECT {', '.join(columns)} FROM {table} WHERE lower({name_column}) = ?",
+                (name,)
+            )
+            row = cursor.fetchone()
+            return dict(zip(columns, row)) if row else None
+
+        def fetch_case(case_name):
+            return fetch_row("refrigeration_cases", "case_name", CASE_COLUMNS, case_name)
+
+        def fetch_walkin(walkin_name):
+            return fetch_row("refrigeration_walkins", "walkin_name", WALKIN_COLUMNS, walkin_name)
+
+    case_data = {}
+    walkin_data = {}
+
+    # CASES ---------------------------------
+    for case_name, count in case_counts.items():
+        row_dict = fetch_case(case_name)
+        if row_dict:
+            row_dict["unit_count"] = count
+            row_dict["total_rated_capacity"] = row_dict["rated_capacity"] * row_dict["unit_length"] * count
+            case_data[row_dict["case_name"]] = row_dict
+
+    # WALK-INS -------------------------------
     for walkin_name, count in walkin_counts.items():
-        cursor.execute("""
-             SELECT
-                walkin_name, template, operation_type,
-                rated_capacity, operating_temperature,
-                rated_cooling_fan_power, lighting_power, lighting_schedule,
-                defrost_type, defrost_control_type, defrost_schedule, drip_down_schedule,
-                stocking_door_u, area_of_stocking_doors_facing_zone, stocking_door_schedule,
-                reachin_door_uvalue, area_of_glass_reachin_doors_facing_zone
-            FROM refrigeration_walkins
-            WHERE lower(walkin_name) = ?
-            """, (walkin_name,))
-        row = cursor.fetchone()
-        if row:
-            columns = [col[0] for col in cursor.description]
-            row_dict = dict(zip(columns, row))
+        row_dict = fetch_walkin(walkin_name)
+        if row_dict:
             row_dict["number_of_units"] = count
             row_dict["total_rated_capacity"] = row_dict["rated_capacity"] * count
-            walkin_data[row[0]] = row_dict
+            walkin_data[row_dict["walkin_name"]] = row_dict
+
+    if snapshot is None:
+        conn.close()
+    return case_data, walkin_data
+
+
+def find_missing_units(requested_names, case_data, walkin_data):
+    """
+    Requested unit names that `get_data_from_db` / `get_data_from_counts` did not resolve.
+
+    Those functions silently drop names that are not in the catalog; callers
+    that must not run a partial store compare against this list.
+
+    Args:
+        requested_names (iterable): Requested case and walk-in names (any case).
+        case_data, walkin_data (dict): Their results.
 
-    conn.close()
-    return case_data, walkin_data
\ No newline at end of file
+    Returns:
+        list: Sorted lowercase names missing from the catalog.
+    """
+    resolved = {name.lower() for name in case_data} | {name.lower() for name in walkin_data}
+    return sorted({name.lower() for name in requested_names} - resolved)
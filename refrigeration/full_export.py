@@ -1,4 +1,6 @@
 import json
+import os
+import re
 from .utils import get_building_name
 
 def export_full_refrigeration_system_to_json(
@@ -43,4 +45,158 @@ def export_full_refrigeration_system_to_json(
 
     print(f"✅ Full OpenStudio Refrigeration JSON saved to: {output_path}")
     print("\n📦 Preview:")
-    print(json.dumps(openstudio_json, indent=2))
\ No newline at end of file
+    print(json.dumps(openstudio_json, indent=2))
+
+# Fields whose values name other objects in the model
+REFERENCE_FIELDS = (
+    "ZoneName", "CompressorCurve", "FanPowerCurve", "CaseAndWalkInListName",
+    "CaseAndWalkInNames", "CompressorListName", "CondenserName"
+)
+
+COMMON_SHARD = "common"
+
+def export_sharded_refrigeration_system_to_json(
+    mt_compressors,
+    lt_compressors,
+    mt_power_curve,
+    mt_capacity_curve,
+    lt_power_curve,
+    lt_capacity_curve,
+    mt_condensers,
+    lt_condensers,
+    mt_curves,
+    lt_curves,
+    case_objects,
+    walkin_objects,
+    system_and_casewalkin_objects,
+    output_dir="Full_Refrigeration_System_shards",
+    shard_by="rack",
+    indent=2
+):
+    """
+    Export the full refrigeration system as one JSON file per shard plus a manifest.
+
+    Zones and compressor performance curves go to the "common" shard. Each
+    rack (one OS:Refrigeration:System) gets its own shard holding its system,
+    case/walk-in list, cases, walk-ins, compressors, condenser and fan curve.
+    With shard_by="operation_type" the racks are grouped into one MT and one
+    LT shard instead. Objects that cannot be attributed to a rack stay in the
+    common shard.
+
+    Args:
+        output_dir (str): Directory for the shard files and manifest.json.
+        shard_by (str): 'rack' or 'operation_type'.
+        indent (int): JSON indentation.
+
+    Returns:
+        dict: The manifest (shards, object counts and cross-shard references).
+    """
+    if shard_by not in ("rack", "operation_type"):
+        raise ValueError("Invalid shard_by. Must be 'rack' or 'operation_type'.")
+
+    def shard_name(operation_type, rack_number):
+        return f"{operation_type}_Rack{rack_number}" if shard_by == "rack" else operation_type
+
+    zones = [
+        {"type": "OS:ThermalZone", "name": "MainSales"},
+        {"type": "OS:ThermalZone", "name": "ActiveStorage"}
+    ]
+    shards = {COMMON_SHARD: zones + [curve for curve in (mt_power_curve, mt_capacity_curve, lt_power_curve, lt_capacity_curve) if curve]}
+    object_shard = {}
+
+    def add(shard, obj):
+        shards.setdefault(shard, []).append(obj)
+        object_shard[id(obj)] = shard
+
+    # Compressors and condensers carry their operation type and rack number in their names
+    for comp in mt_compressors + lt_compressors:
+        match = re.search(r"_(MT|LT)_Rack(\d+)_Comp\d+$", comp["name"])
+        add(shard_name(*match.groups()) if match else COMMON_SHARD, comp)
+    for obj in mt_condensers + lt_condensers + mt_curves + lt_curves:
+        match = re.match(r"(MT|LT)_Rack(\d+)_Condenser", obj["name"])
+        add(shard_name(*match.groups()) if match else COMMON_SHARD, obj)
+
+    # Systems are numbered across MT and LT, so count racks per operation type in order
+    lists_by_name = {obj["name"]: obj for obj in system_and_casewalkin_objects if obj["type"] == "OS:Refrigeration:CaseAndWalkInList"}
+    units_by_name = {obj["name"]: obj for obj in case_objects + walkin_objects}
+    rack_counters = {}
+    for obj in system_and_casewalkin_objects:
+        if obj["type"] != "OS:Refrigeration:System":
+            continue
+        match = re.search(r"_(MT|LT)_Rack\d+$", obj.get("CompressorListName", ""))
+        if not match:
+            add(COMMON_SHARD, obj)
+            continue
+        operation_type = match.group(1)
+        rack_counters[operation_type] = rack_counters.get(operation_type, 0) + 1
+        shard = shard_name(operation_type, rack_counters[operation_type])
+        add(shard, obj)
+
+        case_list = lists_by_name.get(obj.get("CaseAndWalkInListName"))
+        if case_list and id(case_list) not in object_shard:
+            add(shard, case_list)
+            for unit_name in case_list.get("CaseAndWalkInNames", []):
+                unit = units_by_name.get(unit_name)
+                if unit and id(unit) not in object_shard:
+                    add(shard, unit)
+
+    for obj in system_and_casewalkin_objects + case_objects + walkin_objects:
+        if id(obj) not in object_shard:
+            add(COMMON_SHARD, obj)
+
+    # Record references that point outside the referencing object's shard
+    name_to_shard = {}
+    for shard, objects in shards.items():
+        for obj in objects:
+            name_to_shard.setdefault(obj["name"], shard)
+
+    cross_shard_references = []
+    for shard, objects in shards.items():
+        for obj in objects:
+            for field in REFERENCE_FIELDS:
+                targets = obj.get(field)
+                if not targets:
+                    continue
+                for target in targets if isinstance(targets, list) else [targets]:
+                    target_shard = name_to_shard.get(target)
+                    if target_shard != shard:
+                        cross_shard_references.append({
+                            "shard": shard,
+                            "object": obj["name"],
+                            "field": field,
+                            "target": target,
+                            "target_shard": target_shard
+                        })
+
+    os.makedirs(output_dir, exist_ok=True)
+    building = get_building_name()
+    manifest_shards = []
+    for shard, objects in shards.items():
+        file_name = f"{shard}.json"
+        with open(os.path.join(output_dir, file_name), "w") as f:
+            json.dump({"Version": "0.2.1", "Building": building, "objects": objects}, f, indent=indent)
+
+        type_counts = {}
+        for obj in objects:
+            type_counts[obj["type"]] = type_counts.get(obj["type"], 0) + 1
+        manifest_shards.append({
+            "name": shard,
+            "file": file_name,
+            "object_count": len(objects),
+            "object_counts_by_type": type_counts
+        })
+
+    manifest = {
+        "Version": "0.2.1",
+        "Building": building,
+        "shard_by": shard_by,
+        "total_objects": sum(len(objects) for objects in shards.values()),
+        "shards": manifest_shards,
+        "cross_shard_references": cross_shard_references
+    }
+    manifest_path = os.path.join(output_dir, "manifest.json")
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f, indent=indent)
+
+    print(f"✅ {len(shards)} refrigeration JSON shards and manifest saved to: {output_dir}")
+    return manifest
@@ -0,0 +1,208 @@
+from .condenser import get_heat_rejection_factor
+from .curve_fitting import bicubic_coefficients, evaluate_bicubic
+from .compressor import get_compressor_specs
+from .utils import get_suction_temp
+
+FAN_CONTROL_TYPES = ("Fixed", "FixedLinear", "VariableSpeed", "TwoSpeed")
+
+# Air-cooled condenser fan laws (as in the EnergyPlus refrigeration condenser model):
+# airflow ratio = capacity ratio ** 1.58, fan power ratio = airflow ratio ** 2.5
+AIRFLOW_EXPONENT = 1.58
+FAN_POWER_EXPONENT = 2.5
+MINIMUM_AIRFLOW_RATIO = 0.2
+# Two-speed fans run at half airflow on low speed
+HALF_SPEED_CAPACITY = 0.5 ** (1 / AIRFLOW_EXPONENT)
+HALF_SPEED_POWER = 0.5 ** FAN_POWER_EXPONENT
+
+
+def _hourly(load, n_hours):
+    """Expand a constant rack load to an hourly list; pass hourly lists through."""
+    if isinstance(load, (int, float)):
+        return [float(load)] * n_hours
+    if len(load) != n_hours:
+        raise ValueError(f"Rack load has {len(load)} hours, ambient temperatures have {n_hours}.")
+    return load
+
+
+def fan_power_ratio(part_loads, fan_control):
+    """
+    Fan power as a fraction of rated fan power at each heat rejection part-load ratio.
+
+    Fixed: full power whenever the rack runs; FixedLinear: cycles, power = PLR;
+    VariableSpeed: power = max(PLR ** 1.58, 0.2) ** 2.5;
+    TwoSpeed: cycles on low speed up to its capacity, then between low and high.
+    """
+    if fan_control == "Fixed":
+        return [1.0 if plr > 0 else 0.0 for plr in part_loads]
+    elif fan_control == "FixedLinear":
+        return list(part_loads)
+    elif fan_control == "VariableSpeed":
+        return [max(plr ** AIRFLOW_EXPONENT, MINIMUM_AIRFLOW_RATIO) ** FAN_POWER_EXPONENT if plr > 0 else 0.0 for plr in part_loads]
+    elif fan_control == "TwoSpeed":
+        return [
+            HALF_SPEED_POWER * plr / HALF_SPEED_CAPACITY if plr <= HALF_SPEED_CAPACITY
+            else HALF_SPEED_POWER + (plr - HALF_SPEED_CAPACITY) / (1 - HALF_SPEED_CAPACITY) * (1 - HALF_SPEED_POWER)
+            for plr in part_loads
+        ]
+    raise ValueError(f"Invalid fan control type: {fan_control}. Must be one of {', '.join(FAN_CONTROL_TYPES)}.")
+
+
+def simulate_head_pressure(
+    condensers,
+    curves,
+    rack_loads,
+    ambient_temperatures,
+    operation_type,
+    template,
+    fan_control="VariableSpeed",
+    min_condensing_temp=None,
+    refrigerant=None,
+    compressor_power_curve=None
+):
+    """
+    Hourly floating head pressure of every rack's air-cooled condenser.
+
+    The generated fan curve gives heat rejection per K of condensing-to-ambient
+    temperature difference (rated at 5.6 K). Each hour the condensing
+    temperature floats at ambient + required difference, floored at the minimum
+    condensing temperature. Above the floor the fans run at full capacity;
+    on the floor they only need to reject the load at the larger difference,
+    which sets the fan part-load ratio.
+
+    Heat rejected is rack load * (1 + 1/COP), as in `get_condenser_capacity`.
+
+    Args:
+        condensers (list): Condensers from `generate_condenser_objects`.
+        curves (list): Their fan curves (matched by the condenser's FanPowerCurve).
+        rack_loads (list): One entry per condenser, a constant load (W, e.g. rack_load
+            from `calculate_compressors_for_racks`) or an hourly list
+            (e.g. from `calculate_corrected_rack_loads`).
+        ambient_temperatures (list): Hourly ambient dry-bulb temperature (°C).
+        operation_type (str): 'MT' or 'LT'
+        template (str): 'old', 'new', or 'advanced'
+        fan_control (str): One of FAN_CONTROL_TYPES.
+        min_condensing_temp (float): Floor overriding each condenser's
+            MinimumCondensingTemperature, e.g. to compare head pressure settings.
+        refrigerant (str): Refrigerant for SST and compressor capacity (optional).
+        compressor_power_curve (dict): Power curve from `get_compressor_curve`; when
+            given, hourly compressor power is load / compressor capacity * curve(SST, SCT).
+
+    Returns:
+        List[dict]: Per condenser: name, condensing_temperature, fan_part_load,
+        fan_power (W), lift (K) and, with a power curve, compressor_power (W); hourly lists.
+    """
+    ambient = list(ambient_temperatures)
+    n_hours = len(ambient)
+    curves_by_name = {curve["name"]: curve for curve in curves}
+    factor = get_heat_rejection_factor(operation_type)
+    suction_temp = get_suction_temp(template, operation_type, refrigerant)
+
+    if compressor_power_curve:
+        coefficients = bicubic_coefficients(compressor_power_curve)
+        x = min(max(suction_temp, compressor_power_curve["MinimumValueofx"]), compressor_power_curve["MaximumValueofx"])
+        min_y, max_y = compressor_power_curve["MinimumValueofy"], compressor_power_curve["MaximumValueofy"]
+        compressor_capacity = get_compressor_specs(template, operation_type, refrigerant)[0]
+
+    results = []
+    for condenser, load in zip(condensers, rack_loads):
+        curve = curves_by_name[condenser["FanPowerCurve"]]
+        c1, ua = curve["Coefficient1Constant"], curve["Coefficient2x"]
+        t_min = condenser["MinimumCondensingTemperature"] if min_condensing_temp is None else min_condensing_temp
+        heat = [q * factor for q in _hourly(load, n_hours)]
+
+        t_cond = []
+        part_loads = []
+        for q, t_amb in zip(heat, ambient):
+            t_float = t_amb + (q - c1) / ua
+            if t_float >= t_min:
+                t_cond.append(t_float)
+                part_loads.append(1.0 if q > 0 else 0.0)
+            else:
+                t_cond.append(t_min)
+                part_loads.append(min(1.0, max(0.0, q / (c1 + ua * (t_min - t_amb)))))
+
+        result = {
+            "name": condenser["name"],
+            "condensing_temperature": t_cond,
+            "fan_part_load": part_loads,
+            "fan_power": [condenser["FanPower"] * r for r in fan_power_ratio(part_loads, fan_control)],
+            "lift": [t - suction_temp for t in t_cond]
+        }
+        if compressor_power_curve:
+            ys = [min(max(t, min_y), max_y) for t in t_cond]
+            curve_power = evaluate_bicubic(coefficients, [x] * n_hours, ys)
+            result["compressor_power"] = [q / factor / compressor_capacity * p for q, p in zip(heat, curve_power)]
+        results.append(result)
+
+    return results
+
+
+def summarize_head_pressure(results, hours_per_step=1.0):
+    """
+    Annual totals of a head pressure simulation.
+
+    Returns:
+        dict: fan_energy_kwh, compressor_energy_kwh (None without a power curve),
+        mean_lift, max_condensing_temperature and hours_at_minimum (all racks).
+    """
+    fan_energy = sum(sum(r["fan_power"]) for r in results) * hours_per_step / 1000
+    has_compressor = all("compressor_power" in r for r in results)
+    compressor_energy = sum(sum(r["compressor_power"]) for r in results) * hours_per_step / 1000 if has_compressor else None
+    lifts = [v for r in results for v in r["lift"]]
+    t_conds = [v for r in results for v in r["condensing_temperature"]]
+    at_minimum = sum(1 for r in results for plr in r["fan_part_load"] if plr < 1.0) * hours_per_step
+
+    return {
+        "fan_energy_kwh": fan_energy,
+        "compressor_energy_kwh": compressor_energy,
+        "mean_lift": sum(lifts) / len(lifts) if lifts else 0.0,
+        "max_condensing_temperature": max(t_conds) if t_conds else None,
+        "hours_at_minimum": at_minimum
+    }
+
+
+def compare_head_pressure_strategies(
+    condensers,
+    curves,
+    rack_loads,
+    ambient_temperatures,
+    operation_type,
+    template,
+    strategies,
+    refrigerant=None,
+    compressor_power_curve=None
+):
+    """
+    Simulate the same racks under several head pressure control strategies.
+
+    Args:
+        strategies (dict): {strategy_name: {"fan_control": str, "min_condensing_temp": float or None}}
+        Other arguments as in `simulate_head_pressure`.
+
+    Returns:
+        dict: {strategy_name: summary from `summarize_head_pressure`}
+    """
+    comparison = {}
+    for strategy_name, strategy in strategies.items():
+        results = simulate_head_pressure(
+            condensers, curves, rack_loads, ambient_temperatures, operation_type, template,
+            fan_control=strategy.get("fan_control", "VariableSpeed"),
+            min_condensing_temp=strategy.get("min_condensing_temp"),
+            refrigerant=refrigerant,
+            compressor_power_curve=compressor_power_curve
+        )
+        comparison[strategy_name] = summarize_head_pressure(results)
+    return comparison
+
+
+def display_head_pressure_comparison(comparison):
+    """Print annual fan and compressor energy of each head pressure strategy."""
+    print("\n🌡️ Head Pressure Control Comparison:")
+    for strategy_name, summary in comparison.items():
+        compressor = summary["compressor_energy_kwh"]
+        compressor_text = f"{compressor:,.0f} kWh" if compressor is not None else "n/a"
+        print(
+            f"{strategy_name}: Fan = {summary['fan_energy_kwh']:,.0f} kWh, Compressor = {compressor_text}, "
+            f"Mean Lift = {summary['mean_lift']:.1f} K, Max SCT = {summary['max_condensing_temperature']:.1f} °C, "
+            f"Hours at Minimum = {summary['hours_at_minimum']:.0f}"
+        )
@@ -0,0 +1,100 @@
+import json
+import os
+import subprocess
+import sys
+
+# Cold-start budgets: cumulative import time (ms) of a module in a fresh interpreter,
+# best of several runs. The exporters measure ~15 ms, mostly the stdlib json and
+# re modules; eagerly loading a heavy module is caught by DEFERRED_MODULES below.
+IMPORT_BUDGETS_MS = {
+    "refrigeration": 5,
+    "refrigeration.full_export": 25,
+    "refrigeration.json_io": 25,
+}
+
+# Modules that must not be loaded by importing each key
+_HEAVY_MODULES = ("sqlite3", "pickle", "concurrent.futures")
+DEFERRED_MODULES = {
+    "refrigeration": _HEAVY_MODULES + ("refrigeration.db_utils", "refrigeration.compressor"),
+    "refrigeration.full_export": _HEAVY_MODULES,
+    "refrigeration.json_io": _HEAVY_MODULES,
+}
+
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure_import_time(module, repeats=5):
+    """
+    Cumulative import time (ms) of a module in a fresh interpreter, best of `repeats` runs.
+
+    Uses `python -X importtime`, so only the import itself is timed, not
+    interpreter start-up.
+    """
+    timings = []
+    for _ in range(repeats):
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=PACKAGE_ROOT, capture_output=True, text=True, check=True
+        )
+        for line in completed.stderr.splitlines():
+            fields = line.split("|")
+            if len(fields) == 3 and fields[2].strip() == module:
+                timings.append(int(fields[1]) / 1000)
+    if not timings:
+        raise RuntimeError(f"No import time reported for {module}")
+    return min(timings)
+
+
+def loaded_modules_after_import(module):
+    """Names of modules loaded by importing `module` in a fresh interpreter."""
+    completed = subprocess.run(
+        [sys.executable, "-c", f"import json, sys, {module}; print(json.dumps(sorted(sys.modules)))"],
+        cwd=PACKAGE_ROOT, capture_output=True, text=True, check=True
+    )
+    return set(json.loads(completed.stdout))
+
+
+def check_import_budget(budgets=None, deferred_modules=DEFERRED_MODULES, repeats=5, verbose=True):
+    """
+    Enforce the cold-start budget of the package.
+
+    Args:
+        budgets (dict): {module: budget in ms} (defaults to IMPORT_BUDGETS_MS).
+        deferred_modules (dict): {module: modules its import must not load}.
+
+    Raises:
+        RuntimeError: If a module exceeds its budget or loads one of its
+        `deferred_modules`.
+
+    Returns:
+        dict: {module: measured ms}
+    """
+    budgets = budgets or IMPORT_BUDGETS_MS
+    failures = []
+
+    for module, deferred in deferred_modules.items():
+        eager = sorted(set(deferred) & loaded_modules_after_import(module))
+        if eager:
+            failures.append(f"`import {module}` eagerly loads: {', '.join(eager)}")
+
+    measured = {}
+    for module, budget in budgets.items():
+        measured[module] = measure_import_time(module, repeats)
+        if verbose:
+            print(f"{module}: {measured[module]:.1f} ms (budget {budget} ms)")
+        if measured[module] > budget:
+            failures.append(f"{module} imports in {measured[module]:.1f} ms, over its {budget} ms budget")
+
+    if failures:
+        raise RuntimeError("Cold-start budget exceeded:\n" + "\n".join(failures))
+    if verbose:
+        print("✅ Cold-start budget met.")
+    return measured
+
+
+if __name__ == "__main__":
+    try:
+        check_import_budget()
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
@@ -1,5 +1,6 @@
 from refrigeration.utils import get_building_name
 import json
+import time
 
 # Case + Walk-in
 def export_cases_and_walkins_to_json(
@@ -122,4 +123,113 @@ def export_system_and_casewalkin_lists_to_json(
 
     print(f"✅ Refrigeration system + Case/Walk-in list saved to: {output_path}")
     print("\n📦 Preview:")
-    print(json.dumps(openstudio_json, indent=2))
\ No newline at end of file
+    print(json.dumps(openstudio_json, indent=2))
+
+
+# All files in a single pass
+DEFAULT_EXPORT_PATHS = {
+    "cases_and_walkins": "All_Cases_Walkins.json",
+    "compressors": "All_Compressors.json",
+    "condensers": "All_Condensers.json",
+    "system_and_casewalkin_lists": "System_and_CaseWalkin_Lists.json",
+    "full": "Full_Refrigeration_System.json"
+}
+
+def export_all_refrigeration_json(
+    mt_compressors,
+    lt_compressors,
+    mt_power_curve,
+    mt_capacity_curve,
+    lt_power_curve,
+    lt_capacity_curve,
+    mt_condensers,
+    lt_condensers,
+    mt_curves,
+    lt_curves,
+    case_objects,
+    walkin_objects,
+    system_and_casewalkin_objects,
+    output_paths=None,
+    indent=2,
+    max_workers=None,
+    verbose=True
+):
+    """
+    Export every per-component JSON file and the full system file in one pass.
+
+    Each object is serialized once; the encoded fragments are then reused to
+    assemble all files, which are written concurrently. The files are
+    byte-identical to `json.dump(openstudio_json, f, indent=indent)`.
+
+    Args:
+        output_paths (dict): Output path per file key (see DEFAULT_EXPORT_PATHS).
+            Keys left out use the default path; a None path skips that file.
+        indent (int): JSON indentation used for every file.
+        max_workers (int): Writer threads (defaults to one per file).
+        verbose (bool): Print bytes and time per file.
+
+    Returns:
+        dict: {file_key: {"path", "bytes", "seconds"}}
+    """
+    paths = {**DEFAULT_EXPORT_PATHS, **(output_paths or {})}
+    zones = [
+        {"type": "OS:ThermalZone", "name": "MainSales"},
+        {"type": "OS:ThermalZone", "name": "ActiveStorage"}
+    ]
+    curves = [mt_power_curve, mt_capacity_curve, lt_power_curve, lt_capacity_curve]
+
+    file_objects = {
+        "cases_and_walkins": zones + case_objects + walkin_objects,
+        "compressors": zones + curves + mt_compressors + lt_compressors,
+        "condensers": zones + mt_condensers + lt_condensers + mt_curves + lt_curves,
+        "system_and_casewalkin_lists": zones + system_and_casewalkin_objects,
+        "full": (
+            zones + curves +
+            mt_compressors + lt_compressors +
+            mt_condensers + lt_condensers +
+            mt_curves + lt_curves +
+            case_objects + walkin_objects +
+            system_and_casewalkin_objects
+        )
+    }
+    file_objects = {key: objects for key, objects in file_objects.items() if paths.get(key)}
+
+    # Encode each distinct object once, already indented for its place in the "objects" list
+    pad = " " * indent
+    item_pad = pad * 2
+    fragments = {}
+    for objects in file_objects.values():
+        for obj in objects:
+            if id(obj) not in fragments:
+                fragments[id(obj)] = item_pad + json.dumps(obj, indent=indent).replace("\n", "\n" + item_pad)
+
+    header = (
+        "{\n" +
+        f'{pad}"Version": {json.dumps("0.2.1")},\n' +
+        f'{pad}"Building": {json.dumps(get_building_name())},\n' +
+        f'{pad}"objects": '
+    )
+
+    def write_file(key):
+        start = time.perf_counter()
+        objects = file_objects[key]
+        if objects:
+            body = "[\n" + ",\n".join(fragments[id(obj)] for obj in objects) + f"\n{pad}]\n}}"
+        else:
+            body = "[]\n}"
+        data = (header + body).encode("utf-8")
+        with open(paths[key], "wb") as f:
+            f.write(data)
+        return {"path": paths[key], "bytes": len(data), "seconds": time.perf_counter() - start}
+
+    # Imported here so single-file exporters don't pay for concurrent.futures at import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(file_objects) or 1) as executor:
+        report = dict(zip(file_objects, executor.map(write_file, file_objects)))
+
+    if verbose:
+        print("✅ Refrigeration JSON files saved:")
+        for info in report.values():
+            print(f"  - {info['path']}: {info['bytes']:,} bytes in {info['seconds'] * 1000:.1f} ms")
+    return report
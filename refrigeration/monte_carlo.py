@@ -0,0 +1,209 @@
+import math
+import random
+from concurrent.futures import ProcessPoolExecutor
+from .db_utils import get_data_from_db
+from .rack_assignment import get_rack_capacity_limits, pack_units
+from .compressor import get_compressor_specs
+from .condenser import get_condenser_capacity
+
+MONTE_CARLO_METRICS = (
+    "mt_rack_count", "lt_rack_count", "rack_count",
+    "mt_compressor_count", "lt_compressor_count", "compressor_count",
+    "heat_rejection"
+)
+
+
+def build_sampling_items(case_data, walkin_data):
+    """
+    Flatten case and walk-in data into (name, operation_type, unit_count, unit_capacity) tuples.
+
+    Case capacity per unit is rated_capacity (W/m) * unit_length (m); walk-in capacity is rated_capacity (W).
+    """
+    items = []
+    for name, item in case_data.items():
+        items.append((name, item["operation_type"], item["unit_count"], item["rated_capacity"] * item["unit_length"]))
+    for name, item in walkin_data.items():
+        items.append((name, item["operation_type"], item["number_of_units"], item["rated_capacity"]))
+    return items
+
+
+def _percentile(sorted_values, q):
+    """Linear-interpolated percentile (0-100) of an already sorted list."""
+    if not sorted_values:
+        return None
+    pos = (len(sorted_values) - 1) * q / 100
+    lower = math.floor(pos)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (pos - lower)
+
+
+def _count_compressors(racks, compressor_capacity, redundancy):
+    """Same rounding as `calculate_compressors_for_racks`, without building the info dicts."""
+    total = 0
+    for rack in racks:
+        compressors = math.ceil(sum(item['capacity'] for item in rack) / compressor_capacity)
+        total += compressors + (1 if redundancy else 0)
+    return total
+
+
+def _run_batch(args):
+    """Evaluate one batch of samples; module-level so it can run in a process pool."""
+    (items, batch_seed, n_samples, max_mt_capacity, max_lt_capacity, mt_compressor_capacity,
+     lt_compressor_capacity, count_spread, capacity_spread, rack_limit_spread, redundancy) = args
+    rng = random.Random(batch_seed)
+    results = {metric: [] for metric in MONTE_CARLO_METRICS}
+
+    for _ in range(n_samples):
+        mt_units = []
+        lt_units = []
+        for name, operation_type, count, unit_capacity in items:
+            if count_spread:
+                count = max(0, round(rng.gauss(count, count * count_spread)))
+            if capacity_spread:
+                unit_capacity = max(0.0, unit_capacity * rng.gauss(1.0, capacity_spread))
+            if count == 0:
+                continue
+            if operation_type == "MT":
+                mt_units.append((name, unit_capacity * count))
+            elif operation_type == "LT":
+                lt_units.append((name, unit_capacity * count))
+
+        mt_limit = max_mt_capacity
+        lt_limit = max_lt_capacity
+        if rack_limit_spread:
+            mt_limit *= rng.uniform(1 - rack_limit_spread, 1 + rack_limit_spread)
+            lt_limit *= rng.uniform(1 - rack_limit_spread, 1 + rack_limit_spread)
+
+        # Largest first, as in distribute_units
+        mt_units.sort(key=lambda x: x[1], reverse=True)
+        lt_units.sort(key=lambda x: x[1], reverse=True)
+        mt_racks = pack_units(mt_units, mt_limit)
+        lt_racks = pack_units(lt_units, lt_limit)
+
+        mt_compressors = _count_compressors(mt_racks, mt_compressor_capacity, redundancy)
+        lt_compressors = _count_compressors(lt_racks, lt_compressor_capacity, redundancy)
+        heat_rejection = (
+            sum(get_condenser_capacity(sum(item['capacity'] for item in rack), "MT") for rack in mt_racks) +
+            sum(get_condenser_capacity(sum(item['capacity'] for item in rack), "LT") for rack in lt_racks)
+        )
+
+        results["mt_rack_count"].append(len(mt_racks))
+        results["lt_rack_count"].append(len(lt_racks))
+        results["rack_count"].append(len(mt_racks) + len(lt_racks))
+        results["mt_compressor_count"].append(mt_compressors)
+        results["lt_compressor_count"].append(lt_compressors)
+        results["compressor_count"].append(mt_compressors + lt_compressors)
+        results["heat_rejection"].append(heat_rejection)
+
+    return results
+
+
+def summarize_samples(samples, percentiles=(5, 25, 50, 75, 95)):
+    """
+    Reduce per-sample metric lists to mean, min, max and percentiles.
+
+    Returns:
+        dict: {metric: {"mean", "min", "max", "p<q>"...}}
+    """
+    summary = {}
+    for metric, values in samples.items():
+        ordered = sorted(values)
+        stats = {
+            "mean": sum(ordered) / len(ordered) if ordered else None,
+            "min": ordered[0] if ordered else None,
+            "max": ordered[-1] if ordered else None,
+        }
+        for q in percentiles:
+            stats[f"p{q:g}"] = _percentile(ordered, q)
+        summary[metric] = stats
+    return summary
+
+
+def run_monte_carlo(
+    db_path,
+    selected_case_units,
+    selected_walkin_units,
+    template,
+    n_samples=10000,
+    count_spread=0.1,
+    capacity_spread=0.05,
+    rack_limit_spread=0.0,
+    percentiles=(5, 25, 50, 75, 95),
+    seed=None,
+    batch_size=1000,
+    max_workers=None,
+    redundancy=True
+):
+    """
+    Monte Carlo sizing of racks, compressors and condensers for a store.
+
+    The catalog is read once; every sample then perturbs the unit counts
+    (normal, relative std `count_spread`, rounded and floored at 0), the
+    per-unit capacities (normal multiplier, relative std `capacity_spread`)
+    and the MT/LT rack limits (uniform within +/- `rack_limit_spread`), and
+    re-runs rack packing, compressor counts and condenser heat rejection.
+    Samples are evaluated in batches; with `max_workers` > 1 the batches run
+    in a process pool. Results are reproducible for a given `seed` and
+    `batch_size`, independent of the number of workers.
+
+    Args:
+        db_path (str): Path to the SQLite DB.
+        selected_case_units (list): BuildingUnit objects for cases.
+        selected_walkin_units (list): BuildingUnit objects for walk-ins.
+        template (str): 'old', 'new', or 'advanced'
+        n_samples (int): Number of samples.
+        count_spread (float): Relative std of unit counts.
+        capacity_spread (float): Relative std of per-unit capacities.
+        rack_limit_spread (float): Relative half-width of the rack limit range.
+        percentiles (tuple): Percentiles to report.
+        seed (int): Random seed (random if None).
+        batch_size (int): Samples per batch.
+        max_workers (int): Process pool size (None or 1 runs in-process).
+        redundancy (bool): Add one redundant compressor per rack.
+
+    Returns:
+        dict: {"samples": {metric: [...]}, "summary": {metric: {...}}, "seed": int}
+    """
+    case_data, walkin_data = get_data_from_db(db_path, selected_case_units, selected_walkin_units)
+    items = build_sampling_items(case_data, walkin_data)
+
+    max_mt_capacity, max_lt_capacity = get_rack_capacity_limits(template)
+    mt_compressor_capacity = get_compressor_specs(template, "MT")[0]
+    lt_compressor_capacity = get_compressor_specs(template, "LT")[0]
+
+    if seed is None:
+        seed = random.randrange(2**32)
+
+    batches = []
+    for batch_index, start in enumerate(range(0, n_samples, batch_size)):
+        batches.append((
+            items, seed * 1000003 + batch_index, min(batch_size, n_samples - start),
+            max_mt_capacity, max_lt_capacity, mt_compressor_capacity, lt_compressor_capacity,
+            count_spread, capacity_spread, rack_limit_spread, redundancy
+        ))
+
+    if max_workers and max_workers > 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            batch_results = list(executor.map(_run_batch, batches))
+    else:
+        batch_results = [_run_batch(batch) for batch in batches]
+
+    samples = {metric: [] for metric in MONTE_CARLO_METRICS}
+    for result in batch_results:
+        for metric in MONTE_CARLO_METRICS:
+            samples[metric].extend(result[metric])
+
+    return {
+        "samples": samples,
+        "summary": summarize_samples(samples, percentiles),
+        "seed": seed
+    }
+
+
+def display_monte_carlo_summary(summary):
+    """Print the percentile table produced by `run_monte_carlo`."""
+    print("\n🎲 Monte Carlo Sizing Summary:")
+    for metric, stats in summary.items():
+        unit = " W" if metric == "heat_rejection" else ""
+        formatted = ", ".join(f"{key} = {value:.2f}{unit}" for key, value in stats.items() if value is not None)
+        print(f"{metric}: {formatted}")
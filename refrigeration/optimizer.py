@@ -0,0 +1,292 @@
+import itertools
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from .building_unit import SuperMarketSystem
+from .db_utils import get_data_from_db, get_data_from_counts, find_missing_units
+from .rack_assignment import get_rack_capacity_limits, pack_units
+from .compressor import get_compressor_specs, get_compressor_curve, calculate_compressors_for_racks
+from .condenser import generate_condenser_objects
+from .curve_fitting import bicubic_coefficients, evaluate_bicubic
+from .refrigerant import get_capacity_ratio
+from .utils import get_suction_temp, get_min_condensing_temp
+
+VALID_TEMPLATES = ("old", "new", "advanced")
+OBJECTIVES = ("power", "rack_count", "compressor_count")
+
+# Default rack limit grids (W); they include the template limits of get_rack_capacity_limits
+DEFAULT_MT_LIMITS = (30000, 40000, 50000)
+DEFAULT_LT_LIMITS = (15000, 20000, 25000)
+
+
+def _store_units_key(store):
+    """Hashable (cases, walkins) counts of a store, or None to use the SuperMarket defaults."""
+    if not store.get("cases") and not store.get("walkins"):
+        return None
+
+    def counts(entries):
+        totals = {}
+        for entry in entries:
+            totals[entry["name"]] = totals.get(entry["name"], 0) + entry.get("number_of_units", 1)
+        return tuple(sorted(totals.items()))
+
+    return counts(store.get("cases", [])), counts(store.get("walkins", []))
+
+
+@lru_cache(maxsize=256)
+def _resolve_units(db_path, template, units_key):
+    """
+    Catalog data of a store's units for one template (memoized per process).
+
+    Returns:
+        dict: {"MT": [(name, capacity)...], "LT": [...]}, largest first as in
+        distribute_units, and "missing": requested unit names the template's
+        catalog does not have.
+    """
+    if units_key is None:
+        system = SuperMarketSystem(template, db_path)
+        system.load_defaults()
+        requested = {unit.case_name.lower() for unit in system.cases} | {unit.walkin_name.lower() for unit in system.walkins}
+        case_data, walkin_data = get_data_from_db(db_path, system.cases, system.walkins)
+    else:
+        cases, walkins = units_key
+        case_counts = {f"{template} {name}".lower(): count for name, count in cases}
+        walkin_counts = {f"{template} {name}".lower(): count for name, count in walkins}
+        requested = set(case_counts) | set(walkin_counts)
+        case_data, walkin_data = get_data_from_counts(db_path, case_counts, walkin_counts)
+
+    # get_data_from_counts drops names it cannot find; report them instead of packing a partial store
+    groups = {"MT": [], "LT": [], "missing": tuple(find_missing_units(requested, case_data, walkin_data))}
+    for name, item in {**case_data, **walkin_data}.items():
+        if item.get("operation_type") in groups:
+            groups[item["operation_type"]].append((name, item.get("total_rated_capacity") or item.get("rated_capacity")))
+    for operation_type in ("MT", "LT"):
+        groups[operation_type].sort(key=lambda x: x[1], reverse=True)
+    return groups
+
+
+@lru_cache(maxsize=64)
+def _compressor_power(db_path, template, operation_type, refrigerant):
+    """
+    Power (W) of one compressor at the design SST and minimum SCT.
+
+    Uses the template's power curve when the catalog has one, otherwise
+    the rated power of `get_compressor_specs`. Curve power is scaled by the
+    refrigerant's capacity ratio, as the specs are.
+    """
+    curve = get_compressor_curve(db_path, template, operation_type, curve_type="power")
+    if curve is None:
+        return get_compressor_specs(template, operation_type, refrigerant)[1]
+
+    coefficients = bicubic_coefficients(curve)
+    x = min(max(get_suction_temp(template, operation_type, refrigerant), curve["MinimumValueofx"]), curve["MaximumValueofx"])
+    y = min(max(get_min_condensing_temp(template, operation_type, refrigerant), curve["MinimumValueofy"]), curve["MaximumValueofy"])
+    power = evaluate_bicubic(coefficients, [x], [y])[0]
+    if refrigerant:
+        power *= get_capacity_ratio(refrigerant, get_suction_temp(template, operation_type))
+    return power
+
+
+@lru_cache(maxsize=4096)
+def _pack_group(db_path, template, units_key, operation_type, limit):
+    """Racks of one operation type at one rack limit (memoized per process)."""
+    return pack_units(_resolve_units(db_path, template, units_key)[operation_type], limit)
+
+
+@lru_cache(maxsize=4096)
+def _evaluate_group(db_path, template, units_key, operation_type, limit, refrigerant, redundancy):
+    """
+    Metrics of one operation type's racks at one rack limit and refrigerant (memoized per process).
+
+    Every (MT limit, LT limit) combination reuses the MT and LT halves
+    evaluated here instead of re-packing both sides.
+    """
+    racks = _pack_group(db_path, template, units_key, operation_type, limit)
+    info = calculate_compressors_for_racks(racks, operation_type, template, redundancy=redundancy, refrigerant=refrigerant)
+    condensers, _ = generate_condenser_objects(info, operation_type, template, refrigerant)
+    capacity = get_compressor_specs(template, operation_type, refrigerant)[0]
+
+    return {
+        "rack_count": len(racks),
+        "compressor_count": sum(i["compressors_needed"] for i in info),
+        "compressor_power": sum(i["rack_load"] / capacity for i in info) * _compressor_power(db_path, template, operation_type, refrigerant),
+        "fan_power": sum(c["FanPower"] for c in condensers),
+        "heat_rejection": sum(c["RatedEffectiveTotalHeatRejectionRate"] for c in condensers)
+    }
+
+
+def clear_optimizer_cache():
+    """Drop memoized catalog resolutions, packings and evaluations of this process."""
+    for cached in (_resolve_units, _compressor_power, _pack_group, _evaluate_group):
+        cached.cache_clear()
+
+
+def _objective_value(metrics, objective):
+    if callable(objective):
+        return objective(metrics)
+    elif objective == "power":
+        return metrics["compressor_power"] + metrics["fan_power"]
+    elif objective in ("rack_count", "compressor_count"):
+        return metrics[objective]
+    raise ValueError(f"Invalid objective: {objective}. Must be one of {', '.join(OBJECTIVES)} or a callable.")
+
+
+def optimize_store(
+    db_path,
+    store,
+    templates=VALID_TEMPLATES,
+    mt_limits=DEFAULT_MT_LIMITS,
+    lt_limits=DEFAULT_LT_LIMITS,
+    refrigerants=(None,),
+    objective="power",
+    redundancy=True,
+    keep_candidates=False
+):
+    """
+    Search template x MT/LT rack limits x refrigerant for the best configuration of one store.
+
+    MT and LT racks are independent, so each (template, operation type,
+    limit, refrigerant) is evaluated once and combined into every
+    configuration; catalog resolution is shared by all limits and
+    refrigerants of a template. Configurations that raise ValueError
+    (e.g. a refrigerant that cannot reach the minimum condensing
+    temperature) are skipped. With explicit unit lists, so is every
+    configuration of a template whose catalog lacks any of the store's
+    units, so a partial store is never scored. The SuperMarket defaults
+    name units absent from every template's catalog, so default stores
+    are compared on the units that resolve and the rest are reported in
+    missing_units.
+
+    Args:
+        db_path (str): Path to the SQLite DB.
+        store (dict): {"store_id", "cases": [{"name", "number_of_units"}], "walkins": [...]}
+            with names without the template prefix (as in batch_runner scenarios).
+            A store without units uses the SuperMarket defaults of each template.
+        templates (tuple): Templates to search.
+        mt_limits, lt_limits (tuple): Rack capacity limits (W) to search; None uses
+            each template's limits from `get_rack_capacity_limits`.
+        refrigerants (tuple): Refrigerants to search (None = R404A specs).
+        objective (str or callable): 'power' (compressor power at design load plus
+            condenser fan power, W), 'rack_count', 'compressor_count', or a function
+            of the metrics dict.
+        redundancy (bool): Add one redundant compressor per rack.
+        keep_candidates (bool): Also return every evaluated configuration.
+
+    Returns:
+        dict: store_id, best (configuration, metrics and objective), evaluated and
+        skipped counts, missing_units ({template: unit names not in its catalog};
+        excluded from the search for explicit unit lists, left out of the scored
+        store for the defaults) and optionally candidates sorted by objective.
+    """
+    units_key = _store_units_key(store)
+    candidates = []
+    skipped = 0
+    missing_units = {}
+
+    for template in templates:
+        default_mt, default_lt = get_rack_capacity_limits(template)
+        limit_pairs = list(itertools.product(mt_limits or (default_mt,), lt_limits or (default_lt,)))
+        missing = _resolve_units(db_path, template, units_key)["missing"]
+        if missing:
+            missing_units[template] = list(missing)
+            if units_key is not None:
+                skipped += len(limit_pairs) * len(refrigerants)
+                continue
+
+        for refrigerant in refrigerants:
+            for mt_limit, lt_limit in limit_pairs:
+                try:
+                    mt = _evaluate_group(db_path, template, units_key, "MT", mt_limit, refrigerant, redundancy)
+                    lt = _evaluate_group(db_path, template, units_key, "LT", lt_limit, refrigerant, redundancy)
+                except ValueError:
+                    skipped += 1
+                    continue
+
+                metrics = {key: mt[key] + lt[key] for key in mt}
+                metrics.update({f"mt_{key}": value for key, value in mt.items()})
+                metrics.update({f"lt_{key}": value for key, value in lt.items()})
+                candidates.append({
+                    "template": template,
+                    "max_mt_capacity": mt_limit,
+                    "max_lt_capacity": lt_limit,
+                    "refrigerant": refrigerant,
+                    "metrics": metrics,
+                    "objective": _objective_value(metrics, objective)
+                })
+
+    # Stable sort keeps the search order (templates, refrigerants, limits) among ties
+    candidates.sort(key=lambda c: c["objective"])
+    result = {
+        "store_id": store.get("store_id", store.get("scenario_id")),
+        "best": candidates[0] if candidates else None,
+        "evaluated": len(candidates),
+        "skipped": skipped,
+        "missing_units": missing_units
+    }
+    if keep_candidates:
+        result["candidates"] = candidates
+    return result
+
+
+def _optimize_batch(args):
+    """Optimize one batch of stores; module-level so it can run in a process pool."""
+    db_path, stores, options = args
+    return [optimize_store(db_path, store, **options) for store in stores]
+
+
+def optimize_portfolio(db_path, stores, max_workers=None, batch_size=50, **options):
+    """
+    Run `optimize_store` for every store of a portfolio.
+
+    Stores are optimized in batches; with `max_workers` > 1 the batches run
+    in a process pool, and each worker keeps its own evaluation cache, so
+    stores sharing unit lists (e.g. SuperMarket defaults) are evaluated once
+    per worker. A callable objective must be a module-level function to be
+    sent to workers.
+
+    Args:
+        db_path (str): Path to the SQLite DB.
+        stores (list): Store dicts (see `optimize_store`).
+        max_workers (int): Process pool size (None or 1 runs in-process).
+        batch_size (int): Stores per batch.
+        **options: Search options passed to `optimize_store`.
+
+    Returns:
+        List[dict]: One `optimize_store` result per store, in input order.
+    """
+    stores = list(stores)
+    batches = [(db_path, stores[i:i + batch_size], options) for i in range(0, len(stores), batch_size)]
+    start = time.time()
+
+    if max_workers and max_workers > 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = [result for batch in executor.map(_optimize_batch, batches) for result in batch]
+    else:
+        results = [result for batch in batches for result in _optimize_batch(batch)]
+
+    elapsed = time.time() - start
+    print(f"✅ Optimized {len(results)} stores in {elapsed:.1f} s ({len(results) / elapsed if elapsed else math.inf:.1f} stores/s)")
+    return results
+
+
+def display_optimization_results(results):
+    """Print the best configuration of each store."""
+    print("\n🏆 Best Configuration per Store:")
+    for result in results:
+        best = result["best"]
+        if best is None:
+            print(f"{result['store_id']}: ❌ No feasible configuration ({result['skipped']} skipped)")
+            for template, names in result.get("missing_units", {}).items():
+                print(f"   {template}: missing from catalog → {', '.join(names)}")
+            continue
+        metrics = best["metrics"]
+        print(
+            f"{result['store_id']}: Template = {best['template']}, Refrigerant = {best['refrigerant'] or 'R404A'}, "
+            f"MT Limit = {best['max_mt_capacity']} W, LT Limit = {best['max_lt_capacity']} W → "
+            f"Racks = {metrics['rack_count']}, Compressors = {metrics['compressor_count']}, "
+            f"Power = {metrics['compressor_power'] + metrics['fan_power']:,.0f} W"
+        )
+        unscored = result.get("missing_units", {}).get(best["template"])
+        if unscored:
+            print(f"   ⚠️ Not in the {best['template']} catalog, left out of the score → {', '.join(unscored)}")
@@ -1,62 +1,75 @@
+import math
+from bisect import bisect_left, insort
 from refrigeration.db_utils import get_data_from_db
-def assign_racks_to_cases_and_walkins(db_path, selected_case_units, selected_walkin_units, default_max_capacity=30000):
-    # get case and walkin data from DB
-    case_data, walkin_data = get_data_from_db(db_path, selected_case_units, selected_walkin_units)
-
-    # Determine template from selected units
-    template = None
-    if selected_case_units:
-        template = selected_case_units[0].template.lower()
-    elif selected_walkin_units:
-        template = selected_walkin_units[0].template.lower()
 
-    # Set MT and LT limits based on template
+def get_rack_capacity_limits(template, default_max_capacity=30000):
+    """Return (max_mt_capacity, max_lt_capacity) in W for the given template."""
+    template = template.lower() if template else None
     if template == "advanced":
-        max_mt_capacity = 30000
-        max_lt_capacity = 15000
+        return 30000, 15000
     elif template in ["old", "new"]:
-        max_mt_capacity = 50000
-        max_lt_capacity = 25000
-    else:
-        max_mt_capacity = max_lt_capacity = default_max_capacity  # fallback    
+        return 50000, 25000
+    return default_max_capacity, default_max_capacity  # fallback
+
+
+def pack_units(units, max_capacity_per_rack):
+    """
+    Pack (name, capacity) pairs into racks in the given order.
+
+    A new rack is started whenever the next unit does not fit in the current one.
+
+    Returns:
+        List[List[dict]]: racks of {'name', 'capacity'} items
+    """
+    racks = []
+    current_rack = []
+    current_capacity = 0
+
+    for name, total_capacity in units:
+        if current_capacity + total_capacity <= max_capacity_per_rack:
+            current_rack.append({'name': name, 'capacity': total_capacity})
+            current_capacity += total_capacity
+        else:
+            if current_rack:
+                racks.append(current_rack)
+            current_rack = [{'name': name, 'capacity': total_capacity}]
+            current_capacity = total_capacity
 
+    if current_rack:
+        racks.append(current_rack)
+    return racks
+
+
+def distribute_units(data, racks, max_capacity_per_rack):
+    """Pack units largest first, append the racks and embed `assigned_rack` in data."""
+    units = sorted(
+        data.items(),
+        key=lambda x: x[1].get('total_rated_capacity', x[1].get('rated_capacity', 0)),
+        reverse=True
+    )
+    packed = pack_units(
+        [(name, item.get('total_rated_capacity') or item.get('rated_capacity')) for name, item in units],
+        max_capacity_per_rack
+    )
+
+    for rack_index, rack in enumerate(packed, 1):
+        for unit in rack:
+            if unit['name'] in data:
+                data[unit['name']]['assigned_rack'] = rack_index
+    racks.extend(packed)
+
+
+def assign_racks_from_data(case_data, walkin_data, max_mt_capacity, max_lt_capacity):
+    """
+    Assign already loaded case and walk-in data to MT and LT racks.
+
+    Returns:
+        Tuple[list, list, dict, dict]: (mt_racks, lt_racks, case_data, walkin_data)
+    """
     # assign cases and walkins to MT rack and LT rack
     mt_racks = []
     lt_racks = []
 
-    def distribute_units(data, racks, max_capacity_per_rack, is_walkin=False):
-        units = sorted(
-            data.items(),
-            key=lambda x: x[1].get('total_rated_capacity', x[1].get('rated_capacity', 0)),
-            reverse=True
-        )
-
-        current_rack = []
-        current_capacity = 0
-        rack_index = 1
-
-        for name, item in units:
-            total_capacity = item.get('total_rated_capacity') or item.get('rated_capacity')
-
-            if current_capacity + total_capacity <= max_capacity_per_rack:
-                current_rack.append({'name': name, 'capacity': total_capacity})
-                current_capacity += total_capacity
-            else:
-                if current_rack:
-                    for unit in current_rack:
-                        if unit['name'] in data:
-                            data[unit['name']]['assigned_rack'] = rack_index
-                    racks.append(current_rack)
-                    rack_index += 1
-                current_rack = [{'name': name, 'capacity': total_capacity}]
-                current_capacity = total_capacity
-
-        if current_rack:
-            for unit in current_rack:
-                if unit['name'] in data:
-                    data[unit['name']]['assigned_rack'] = rack_index
-            racks.append(current_rack)
-
     mt_case_data = {name: item for name, item in case_data.items() if item.get('operation_type') == 'MT'}
     mt_walkin_data = {name: item for name, item in walkin_data.items() if item.get('operation_type') == 'MT'}
     lt_case_data = {name: item for name, item in case_data.items() if item.get('operation_type') == 'LT'}
@@ -78,6 +91,459 @@ def assign_racks_to_cases_and_walkins(db_path, selected_case_units, selected_wal
 
     return mt_racks, lt_racks, case_data, walkin_data
 
+
+def assign_racks_to_cases_and_walkins(db_path, selected_case_units, selected_walkin_units, default_max_capacity=30000):
+    # get case and walkin data from DB
+    case_data, walkin_data = get_data_from_db(db_path, selected_case_units, selected_walkin_units)
+
+    # Determine template from selected units
+    template = None
+    if selected_case_units:
+        template = selected_case_units[0].template.lower()
+    elif selected_walkin_units:
+        template = selected_walkin_units[0].template.lower()
+
+    # Set MT and LT limits based on template
+    max_mt_capacity, max_lt_capacity = get_rack_capacity_limits(template, default_max_capacity)
+
+    return assign_racks_from_data(case_data, walkin_data, max_mt_capacity, max_lt_capacity)
+
+class IncrementalRackPacker:
+    """
+    Racks of one operation type, indexed by residual capacity.
+
+    Inserting a unit places it in the rack with the smallest residual capacity
+    that still fits it (binary search over the index), or opens a new rack.
+    Removing a unit only touches its own rack; a rack left empty is replaced
+    by the last rack so rack numbers stay contiguous.
+    """
+
+    def __init__(self, max_capacity_per_rack):
+        self.max_capacity = max_capacity_per_rack
+        self.racks = []              # [[{'name', 'capacity'}, ...], ...] as returned by distribute_units
+        self.loads = []              # total capacity per rack
+        self._residual_index = []    # sorted (residual capacity, rack index)
+        self._unit_rack = {}         # unit name -> rack index
+
+    def __contains__(self, name):
+        return name in self._unit_rack
+
+    def rack_number(self, name):
+        """Return the 1-based rack number of a unit."""
+        return self._unit_rack[name] + 1
+
+    def _index_remove(self, rack_index):
+        entry = (self.max_capacity - self.loads[rack_index], rack_index)
+        del self._residual_index[bisect_left(self._residual_index, entry)]
+
+    def _index_add(self, rack_index):
+        insort(self._residual_index, (self.max_capacity - self.loads[rack_index], rack_index))
+
+    def insert(self, name, capacity):
+        """
+        Add a unit to the best-fitting rack.
+
+        Returns:
+            int: The 1-based rack number the unit was placed in.
+        """
+        if name in self._unit_rack:
+            raise ValueError(f"Unit already assigned: {name}")
+
+        pos = bisect_left(self._residual_index, (capacity, -1))
+        if pos < len(self._residual_index):
+            rack_index = self._residual_index[pos][1]
+            del self._residual_index[pos]
+        else:
+            rack_index = len(self.racks)
+            self.racks.append([])
+            self.loads.append(0)
+
+        self.racks[rack_index].append({'name': name, 'capacity': capacity})
+        self.loads[rack_index] += capacity
+        self._unit_rack[name] = rack_index
+        self._index_add(rack_index)
+        return rack_index + 1
+
+    def remove(self, name):
+        """
+        Remove a unit from its rack.
+
+        Returns:
+            List[str]: Names of units whose rack number changed because an
+            emptied rack was replaced by the last rack.
+        """
+        rack_index = self._unit_rack.pop(name)
+        rack = self.racks[rack_index]
+        self._index_remove(rack_index)
+        for i, item in enumerate(rack):
+            if item['name'] == name:
+                self.loads[rack_index] -= item['capacity']
+                del rack[i]
+                break
+
+        if rack:
+            self._index_add(rack_index)
+            return []
+
+        # Fill the hole with the last rack to keep rack numbers contiguous
+        last_index = len(self.racks) - 1
+        moved = []
+        if rack_index != last_index:
+            self._index_remove(last_index)
+            self.racks[rack_index] = self.racks[last_index]
+            self.loads[rack_index] = self.loads[last_index]
+            for item in self.racks[rack_index]:
+                self._unit_rack[item['name']] = rack_index
+                moved.append(item['name'])
+            self._index_add(rack_index)
+        self.racks.pop()
+        self.loads.pop()
+        return moved
+
+    def rebuild(self, units):
+        """Repack (name, capacity) pairs from scratch, exactly like distribute_units."""
+        self.racks = pack_units(sorted(units, key=lambda x: x[1], reverse=True), self.max_capacity)
+        self.loads = [sum(item['capacity'] for item in rack) for rack in self.racks]
+        self._unit_rack = {item['name']: i for i, rack in enumerate(self.racks) for item in rack}
+        self._residual_index = sorted((self.max_capacity - load, i) for i, load in enumerate(self.loads))
+
+
+class IncrementalRackAssignment:
+    """
+    Persistent MT/LT rack assignment supporting single-unit edits.
+
+    Starts from the same packing as `assign_racks_from_data`, then applies
+    additions and removals one unit at a time without re-reading the DB or
+    repacking, keeping `assigned_rack` in case_data / walkin_data up to date.
+    Call `rebalance()` to repack everything when racks have become fragmented.
+    """
+
+    def __init__(self, case_data, walkin_data, template=None, max_mt_capacity=None, max_lt_capacity=None, default_max_capacity=30000):
+        default_mt, default_lt = get_rack_capacity_limits(template, default_max_capacity)
+        self.case_data = case_data
+        self.walkin_data = walkin_data
+        self.packers = {
+            "MT": IncrementalRackPacker(max_mt_capacity or default_mt),
+            "LT": IncrementalRackPacker(max_lt_capacity or default_lt)
+        }
+        self.rebalance()
+
+    @property
+    def mt_racks(self):
+        return self.packers["MT"].racks
+
+    @property
+    def lt_racks(self):
+        return self.packers["LT"].racks
+
+    def _item(self, name):
+        return self.case_data.get(name) or self.walkin_data.get(name)
+
+    @staticmethod
+    def _capacity(item):
+        return item.get('total_rated_capacity') or item.get('rated_capacity')
+
+    def _annotate(self, packer, names):
+        for name in names:
+            self._item(name)['assigned_rack'] = packer.rack_number(name)
+
+    def add_unit(self, name, item, is_walkin=False):
+        """
+        Add a case or walk-in (a row as returned by `get_data_from_db`).
+
+        Returns:
+            int: The assigned rack number.
+        """
+        packer = self.packers[item['operation_type']]
+        (self.walkin_data if is_walkin else self.case_data)[name] = item
+        item['assigned_rack'] = packer.insert(name, self._capacity(item))
+        return item['assigned_rack']
+
+    def remove_unit(self, name):
+        """Remove a case or walk-in and return its data row."""
+        data = self.case_data if name in self.case_data else self.walkin_data
+        item = data.pop(name)
+        packer = self.packers[item['operation_type']]
+        self._annotate(packer, packer.remove(name))
+        item.pop('assigned_rack', None)
+        return item
+
+    def set_unit_count(self, name, count):
+        """
+        Change the number of units of an assigned case or walk-in.
+
+        Returns:
+            int or None: The new rack number (None when the count drops to 0).
+        """
+        is_walkin = name in self.walkin_data
+        item = self.remove_unit(name)
+        if count <= 0:
+            return None
+        if is_walkin:
+            item['number_of_units'] = count
+            item['total_rated_capacity'] = item['rated_capacity'] * count
+        else:
+            item['unit_count'] = count
+            item['total_rated_capacity'] = item['rated_capacity'] * item['unit_length'] * count
+        return self.add_unit(name, item, is_walkin)
+
+    def rebalance(self):
+        """Repack all units from scratch (same result as `assign_racks_from_data`)."""
+        for operation_type, packer in self.packers.items():
+            units = [
+                (name, self._capacity(item))
+                for data in (self.case_data, self.walkin_data)
+                for name, item in data.items()
+                if item.get('operation_type') == operation_type
+            ]
+            packer.rebuild(units)
+            self._annotate(packer, [name for name, _ in units])
+
+
+def get_unit_temperature(item):
+    """
+    Evaporator temperature (°C) of a case or walk-in row.
+
+    Cases use evaporator_temperature and walk-ins rated_cooling_source_temperature,
+    falling back to the operating temperature when those are missing.
+    """
+    for key in ("evaporator_temperature", "rated_cooling_source_temperature", "case_operating_temperature", "operating_temperature"):
+        if item.get(key) is not None:
+            return item[key]
+    return None
+
+
+class MultiConstraintRackPacker:
+    """
+    Racks of one operation type packed on capacity, unit count and evaporator temperature band.
+
+    Open racks are indexed per zone by residual capacity. A unit goes to the
+    best-fitting rack of its own zone (smallest residual capacity that fits,
+    found by binary search) that also keeps the rack within the unit count
+    and temperature band limits. With soft zone affinity it may then join the
+    best-fitting rack of another zone before a new rack is opened; with
+    strict zones racks never mix zones. A unit that breaks a limit on its
+    own gets its own rack, as in `pack_units`.
+    """
+
+    def __init__(self, max_capacity_per_rack, max_units_per_rack=None, temperature_band=None, strict_zones=False):
+        self.max_capacity = max_capacity_per_rack
+        self.max_units = max_units_per_rack
+        self.temperature_band = temperature_band
+        self.strict_zones = strict_zones
+        self.racks = []              # [[{'name', 'capacity'}, ...], ...] as returned by distribute_units
+        self.loads = []              # total capacity per rack
+        self.unit_counts = []        # total units per rack
+        self.temperatures = []       # (min, max) evaporator temperature per rack, None if unknown
+        self.zones = []              # zone of the rack's first unit
+        self._zone_index = {}        # zone -> sorted (residual capacity, rack index) of racks with room
+
+    def _fits(self, rack_index, unit_count, temperature):
+        if self.max_units is not None and self.unit_counts[rack_index] + unit_count > self.max_units:
+            return False
+        if self.temperature_band is not None and temperature is not None and self.temperatures[rack_index]:
+            low, high = self.temperatures[rack_index]
+            if max(high, temperature) - min(low, temperature) > self.temperature_band:
+                return False
+        return True
+
+    def _best_fit(self, zone, capacity, unit_count, temperature):
+        """Return (index position, rack index) of the tightest feasible rack of a zone, or None."""
+        index = self._zone_index.get(zone, [])
+        for pos in range(bisect_left(index, (capacity, -1)), len(index)):
+            if self._fits(index[pos][1], unit_count, temperature):
+                return pos, index[pos][1]
+        return None
+
+    def insert(self, name, capacity, unit_count=1, temperature=None, zone=None):
+        """
+        Add a unit to the best-fitting feasible rack.
+
+        Returns:
+            int: The 1-based rack number the unit was placed in.
+        """
+        found = self._best_fit(zone, capacity, unit_count, temperature)
+        rack_zone = zone
+        if found is None and not self.strict_zones:
+            candidates = []
+            for other_zone in self._zone_index:
+                if other_zone != zone:
+                    other = self._best_fit(other_zone, capacity, unit_count, temperature)
+                    if other is not None:
+                        candidates.append((self._zone_index[other_zone][other[0]][0], other_zone, other))
+            if candidates:
+                _, rack_zone, found = min(candidates, key=lambda c: c[0])
+
+        if found is not None:
+            pos, rack_index = found
+            del self._zone_index[rack_zone][pos]
+        else:
+            rack_index = len(self.racks)
+            self.racks.append([])
+            self.loads.append(0)
+            self.unit_counts.append(0)
+            self.temperatures.append(None)
+            self.zones.append(zone)
+            rack_zone = zone
+
+        self.racks[rack_index].append({'name': name, 'capacity': capacity})
+        self.loads[rack_index] += capacity
+        self.unit_counts[rack_index] += unit_count
+        if temperature is not None:
+            low, high = self.temperatures[rack_index] or (temperature, temperature)
+            self.temperatures[rack_index] = (min(low, temperature), max(high, temperature))
+
+        # Racks that cannot take another unit leave the index so searches skip them
+        if self.max_units is None or self.unit_counts[rack_index] < self.max_units:
+            insort(self._zone_index.setdefault(rack_zone, []), (self.max_capacity - self.loads[rack_index], rack_index))
+        return rack_index + 1
+
+
+def split_unit_entries(data, count_key, max_units_per_rack):
+    """
+    Replace entries with more units than a rack may hold by chunk entries.
+
+    Each chunk is a copy of the entry with at most `max_units_per_rack` units
+    and its share of total_rated_capacity, keyed "<name> Part <n>" and carrying
+    `split_from` / `split_suffix` so the case and system objects can name it.
+    Unit counts may be floats (building_category_mapping.number_of_units is REAL).
+
+    Args:
+        data (dict): case_data or walkin_data from `get_data_from_db`.
+        count_key (str): 'unit_count' for cases, 'number_of_units' for walk-ins.
+        max_units_per_rack (int): Maximum units per rack (None = no split).
+
+    Returns:
+        dict: New data dict; entries that fit on one rack are kept as they are.
+    """
+    if not max_units_per_rack:
+        return data
+
+    split = {}
+    for name, item in data.items():
+        unit_count = item.get(count_key) or 1
+        n_chunks = math.ceil(unit_count / max_units_per_rack)
+        if n_chunks <= 1:
+            split[name] = item
+            continue
+        capacity = item.get('total_rated_capacity') or item.get('rated_capacity')
+        for i in range(n_chunks):
+            count = min(max_units_per_rack, unit_count - i * max_units_per_rack)
+            chunk = dict(item)
+            chunk[count_key] = count
+            chunk['total_rated_capacity'] = capacity * count / unit_count
+            chunk['split_from'] = name
+            chunk['split_suffix'] = f"Part {i + 1}"
+            split[f"{name} Part {i + 1}"] = chunk
+    return split
+
+
+def assign_racks_multi_constraint(
+    case_data,
+    walkin_data,
+    max_mt_capacity,
+    max_lt_capacity,
+    unit_zones=None,
+    max_units_per_rack=None,
+    temperature_band=None,
+    strict_zones=False
+):
+    """
+    Assign case and walk-in data to MT and LT racks under several constraints.
+
+    Units are placed largest first (first-fit decreasing order) into the
+    best-fitting rack that respects the rack capacity, the maximum number
+    of units per rack (cases count unit_count, walk-ins number_of_units) and
+    the evaporator temperature band, preferring racks of the unit's zone
+    (see `MultiConstraintRackPacker`). An entry with more units than
+    `max_units_per_rack` is first split into separate chunk entries (see
+    `split_unit_entries`), so every case or walk-in entry sits on exactly
+    one rack.
+
+    Args:
+        case_data, walkin_data (dict): From `get_data_from_db`.
+        max_mt_capacity, max_lt_capacity (float): Rack capacity limits (W).
+        unit_zones (dict): {lowercase unit name: zone name}; units without a zone share one group.
+        max_units_per_rack (int): Maximum units per rack (None = no limit).
+        temperature_band (float): Maximum evaporator temperature spread within a rack (K, None = no limit).
+        strict_zones (bool): Never mix zones on a rack.
+
+    Returns:
+        Tuple[list, list, dict, dict]: (mt_racks, lt_racks, case_data, walkin_data),
+        the same structures as `assign_racks_from_data`, with split entries
+        replaced by their chunks.
+    """
+    unit_zones = unit_zones or {}
+    case_data = split_unit_entries(case_data, 'unit_count', max_units_per_rack)
+    walkin_data = split_unit_entries(walkin_data, 'number_of_units', max_units_per_rack)
+    combined = {**case_data, **walkin_data}
+    packers = {
+        "MT": MultiConstraintRackPacker(max_mt_capacity, max_units_per_rack, temperature_band, strict_zones),
+        "LT": MultiConstraintRackPacker(max_lt_capacity, max_units_per_rack, temperature_band, strict_zones)
+    }
+
+    units = sorted(
+        ((name, item) for name, item in combined.items() if item.get('operation_type') in packers),
+        key=lambda x: x[1].get('total_rated_capacity') or x[1].get('rated_capacity'),
+        reverse=True
+    )
+    for name, item in units:
+        packer = packers[item['operation_type']]
+        item['assigned_rack'] = packer.insert(
+            name,
+            item.get('total_rated_capacity') or item.get('rated_capacity'),
+            unit_count=item.get('unit_count') or item.get('number_of_units') or 1,
+            temperature=get_unit_temperature(item),
+            zone=unit_zones.get(item.get('split_from', name).lower())
+        )
+        if 'split_from' in item:
+            packer.racks[item['assigned_rack'] - 1][-1].update(split_from=item['split_from'], split_suffix=item['split_suffix'])
+
+    return packers["MT"].racks, packers["LT"].racks, case_data, walkin_data
+
+
+def assign_racks_by_zone(
+    db_path,
+    selected_case_units,
+    selected_walkin_units,
+    max_units_per_rack=None,
+    temperature_band=None,
+    strict_zones=False,
+    default_max_capacity=30000
+):
+    """
+    Zone-aware counterpart of `assign_racks_to_cases_and_walkins`.
+
+    Zones come from `BuildingUnit.zone_name`. Units of the same name are
+    aggregated into one rack entry, which takes the zone of the first of them.
+
+    Returns:
+        Tuple[list, list, dict, dict]: (mt_racks, lt_racks, case_data, walkin_data)
+    """
+    case_data, walkin_data = get_data_from_db(db_path, selected_case_units, selected_walkin_units)
+
+    unit_zones = {}
+    for unit in selected_case_units:
+        unit_zones.setdefault(unit.case_name.lower(), unit.zone_name)
+    for unit in selected_walkin_units:
+        unit_zones.setdefault(unit.walkin_name.lower(), unit.zone_name)
+
+    template = None
+    if selected_case_units:
+        template = selected_case_units[0].template.lower()
+    elif selected_walkin_units:
+        template = selected_walkin_units[0].template.lower()
+    max_mt_capacity, max_lt_capacity = get_rack_capacity_limits(template, default_max_capacity)
+
+    return assign_racks_multi_constraint(
+        case_data, walkin_data, max_mt_capacity, max_lt_capacity,
+        unit_zones=unit_zones,
+        max_units_per_rack=max_units_per_rack,
+        temperature_band=temperature_band,
+        strict_zones=strict_zones
+    )
+
+
 def display_rack_capacity(racks, selected_units, rack_type=""):
     print(f"\n{rack_type} Racks:")
     name_to_osm = {}
@@ -89,7 +555,85 @@ def display_rack_capacity(racks, selected_units, rack_type=""):
         total_capacity = sum(item['capacity'] for item in rack)
         print(f"Rack {i}: Total Capacity = {total_capacity:.2f} W")
         for item in rack:
-            original_name = item['name']
+            original_name = item.get('split_from', item['name'])
             osm_display = name_to_osm.get(original_name, original_name)  # fallback 처리
+            if 'split_from' in item:
+                osm_display = f"{osm_display} {item['split_suffix']}"
             print(f"  - {osm_display} : {item['capacity']:.2f} W")
-        print()
\ No newline at end of file
+        print()
+
+
+def check_multi_constraint_assignment(db_path, templates=("old", "new", "advanced"), option_sets=None):
+    """
+    Run `assign_racks_by_zone` on the SuperMarket defaults (automated mode) of each template.
+
+    Checks, for every option set, that each case / walk-in entry lands on
+    exactly one rack, no rack holds more than max_units_per_rack units
+    (unless a single entry does), total capacity is conserved, and every
+    OS case / walk-in name appears in exactly one CaseAndWalkInList.
+
+    Args:
+        db_path (str): Path to the SQLite DB.
+        templates (tuple): Templates whose defaults are checked.
+        option_sets (list): Keyword arguments for `assign_racks_by_zone`.
+
+    Raises:
+        RuntimeError: Listing every violated check.
+
+    Returns:
+        dict: {(template, index of option set): (MT rack count, LT rack count)}
+    """
+    from .building_unit import SuperMarketSystem
+    from .case_walkin_objects import generate_case_objects_from_data, generate_walkin_objects_from_data
+    from .system_objects import generate_system_and_casewalkin_lists
+
+    option_sets = option_sets or [{}, {"max_units_per_rack": 5}, {"temperature_band": 5}, {"strict_zones": True}]
+    failures = []
+    rack_counts = {}
+
+    for template in templates:
+        system = SuperMarketSystem(template, db_path)
+        system.load_defaults()
+        source_cases, source_walkins = get_data_from_db(db_path, system.cases, system.walkins)
+        expected_load = sum(item['total_rated_capacity'] for item in {**source_cases, **source_walkins}.values())
+
+        for i, options in enumerate(option_sets):
+            label = f"{template} {options or 'defaults'}"
+            mt_racks, lt_racks, case_data, walkin_data = assign_racks_by_zone(db_path, system.cases, system.walkins, **options)
+            rack_counts[(template, i)] = (len(mt_racks), len(lt_racks))
+            racks = mt_racks + lt_racks
+            combined = {**case_data, **walkin_data}
+
+            placed = [item['name'] for rack in racks for item in rack]
+            if sorted(placed) != sorted(combined):
+                failures.append(f"{label}: racks hold {len(placed)} entries for {len(combined)} units")
+            if abs(sum(item['capacity'] for rack in racks for item in rack) - expected_load) > 1e-6 * max(expected_load, 1):
+                failures.append(f"{label}: rack capacity does not add up to the store load")
+            max_units = options.get("max_units_per_rack")
+            for rack in racks:
+                counts = [combined[item['name']].get('unit_count') or combined[item['name']].get('number_of_units') or 1 for item in rack]
+                if max_units and len(rack) > 1 and sum(counts) > max_units:
+                    failures.append(f"{label}: rack holds {sum(counts)} units, over {max_units}")
+
+            lists = [obj for obj in generate_system_and_casewalkin_lists(system.cases, system.walkins, mt_racks, lt_racks, template)
+                     if obj["type"] == "OS:Refrigeration:CaseAndWalkInList"]
+            listed = [name for obj in lists for name in obj["CaseAndWalkInNames"]]
+            objects = generate_case_objects_from_data(case_data, system.cases) + generate_walkin_objects_from_data(walkin_data, system.walkins)
+            if sorted(listed) != sorted(obj["name"] for obj in objects):
+                failures.append(f"{label}: case / walk-in objects and CaseAndWalkInLists do not match one to one")
+
+    if failures:
+        raise RuntimeError("Rack assignment check failed:\n" + "\n".join(failures))
+    print(f"✅ Rack assignment check passed for {len(rack_counts)} template / option combinations.")
+    return rack_counts
+
+
+if __name__ == "__main__":
+    # Check: python -m refrigeration.rack_assignment [db_path]
+    import sys
+
+    try:
+        check_multi_constraint_assignment(sys.argv[1] if len(sys.argv) > 1 else "database/openstudio_refrigeration_system.db")
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
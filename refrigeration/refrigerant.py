@@ -0,0 +1,204 @@
+import math
+from bisect import bisect_right
+from functools import lru_cache
+
+# Refrigerant the template specs (compressor capacity, SST/SCT) are defined for
+BASELINE_REFRIGERANT = "R404A"
+
+# Precomputed saturation tables: temperature (°C) -> absolute pressure (kPa).
+# Blends list bubble and dew pressures; pure fluids and azeotropes use one column for both.
+# Values are rounded screening data; use the manufacturer's tables for final design.
+SATURATION_TABLES = {
+    "R404A": {
+        "critical_temperature": 72.1,
+        "temperature": (-50, -40, -30, -20, -10, 0, 10, 20, 30, 40, 50, 60),
+        "bubble": (84, 133, 206, 307, 441, 614, 833, 1104, 1433, 1829, 2300, 2860),
+        "dew": (81, 129, 200, 299, 431, 601, 817, 1085, 1412, 1806, 2275, 2830),
+    },
+    "R507A": {
+        "critical_temperature": 70.6,
+        "temperature": (-50, -40, -30, -20, -10, 0, 10, 20, 30, 40, 50, 60),
+        "bubble": (87, 139, 214, 318, 456, 633, 856, 1131, 1465, 1866, 2343, 2900),
+        "dew": (87, 139, 214, 318, 456, 633, 856, 1131, 1465, 1866, 2343, 2900),
+    },
+    "R448A": {
+        "critical_temperature": 83.7,
+        "temperature": (-50, -40, -30, -20, -10, 0, 10, 20, 30, 40, 50, 60),
+        "bubble": (83, 133, 205, 304, 436, 607, 823, 1090, 1415, 1805, 2266, 2810),
+        "dew": (61.3, 101.5, 161.1, 245.7, 360.8, 513, 708.4, 953.4, 1254.8, 1619.9, 2055.7, 2571.5),
+    },
+    "R449A": {
+        "critical_temperature": 81.5,
+        "temperature": (-50, -40, -30, -20, -10, 0, 10, 20, 30, 40, 50, 60),
+        "bubble": (84, 134.6, 207.5, 307.6, 441.2, 614.3, 832.9, 1103.1, 1432, 1826.7, 2293.2, 2843.7),
+        "dew": (63.3, 104.7, 165.8, 252.3, 369.9, 525.2, 724.5, 974, 1280.8, 1652.1, 2095, 2619.2),
+    },
+    "R22": {
+        "critical_temperature": 96.1,
+        "temperature": (-50, -40, -30, -20, -10, 0, 10, 20, 30, 40, 50, 60),
+        "bubble": (64.5, 105, 164, 245, 355, 498, 681, 910, 1192, 1534, 1943, 2427),
+        "dew": (64.5, 105, 164, 245, 355, 498, 681, 910, 1192, 1534, 1943, 2427),
+    },
+    "R134a": {
+        "critical_temperature": 101.1,
+        "temperature": (-50, -40, -30, -20, -10, 0, 10, 20, 30, 40, 50, 60),
+        "bubble": (29.4, 51.2, 84.4, 132.7, 200.6, 292.8, 414.6, 571.7, 770.2, 1016.6, 1317.9, 1681.8),
+        "dew": (29.4, 51.2, 84.4, 132.7, 200.6, 292.8, 414.6, 571.7, 770.2, 1016.6, 1317.9, 1681.8),
+    },
+    "R290": {
+        "critical_temperature": 96.7,
+        "temperature": (-50, -40, -30, -20, -10, 0, 10, 20, 30, 40, 50, 60),
+        "bubble": (70.5, 111.1, 167.7, 244.5, 345.2, 474.5, 636.6, 836.2, 1079, 1369, 1713, 2118),
+        "dew": (70.5, 111.1, 167.7, 244.5, 345.2, 474.5, 636.6, 836.2, 1079, 1369, 1713, 2118),
+    },
+    "R744": {
+        "critical_temperature": 30.98,
+        "temperature": (-50, -40, -30, -20, -10, 0, 10, 20, 30, 30.98),
+        "bubble": (682, 1005, 1428, 1970, 2649, 3485, 4502, 5729, 7214, 7377),
+        "dew": (682, 1005, 1428, 1970, 2649, 3485, 4502, 5729, 7214, 7377),
+    },
+}
+
+
+def list_refrigerants():
+    """Return the refrigerants with shipped saturation tables."""
+    return sorted(SATURATION_TABLES)
+
+
+@lru_cache(maxsize=None)
+def get_saturation_table(refrigerant):
+    """
+    Return the interpolation-ready saturation table of a refrigerant (cached per process).
+
+    Saturation pressure is interpolated as ln(P) linear in 1/T (Clausius-Clapeyron),
+    which is far more accurate between 10 K grid points than linear P(T).
+    """
+    if refrigerant not in SATURATION_TABLES:
+        raise ValueError(f"Unknown refrigerant: {refrigerant}. Available: {', '.join(list_refrigerants())}")
+    table = SATURATION_TABLES[refrigerant]
+    return {
+        "critical_temperature": table["critical_temperature"],
+        "temperature": tuple(table["temperature"]),
+        "inv_t": tuple(1 / (t + 273.15) for t in table["temperature"]),
+        "bubble": tuple(math.log(p) for p in table["bubble"]),
+        "dew": tuple(math.log(p) for p in table["dew"]),
+    }
+
+
+def _segment(grid, value, refrigerant):
+    """Index i of the ascending grid segment [grid[i], grid[i + 1]] holding value."""
+    if not grid[0] <= value <= grid[-1]:
+        raise ValueError(f"{value} is outside the {refrigerant} saturation table range [{grid[0]}, {grid[-1]}].")
+    return min(bisect_right(grid, value) - 1, len(grid) - 2)
+
+
+def _as_list(values):
+    """(values as a list, whether a single value was given); any non-string iterable is a sequence."""
+    if isinstance(values, (int, float, str)) or not hasattr(values, "__iter__"):
+        return [values], True
+    return list(values), False
+
+
+def saturation_pressure(refrigerant, temperatures, point="dew"):
+    """
+    Saturation pressure (kPa) at one or many temperatures (°C).
+
+    Args:
+        refrigerant (str): e.g. 'R404A', 'R448A', 'R744'
+        temperatures (float or iterable): Saturation temperatures (°C).
+        point (str): 'dew' or 'bubble' (only differs for blends with glide).
+
+    Returns:
+        float or list: Pressure(s) in kPa, matching the shape of the input.
+    """
+    table = get_saturation_table(refrigerant)
+    grid, inv_t, ln_p = table["temperature"], table["inv_t"], table[point]
+    values, scalar = _as_list(temperatures)
+
+    pressures = []
+    for t in values:
+        i = _segment(grid, t, refrigerant)
+        x = 1 / (t + 273.15)
+        slope = (ln_p[i + 1] - ln_p[i]) / (inv_t[i + 1] - inv_t[i])
+        pressures.append(math.exp(ln_p[i] + slope * (x - inv_t[i])))
+    return pressures[0] if scalar else pressures
+
+
+def saturation_temperature(refrigerant, pressures, point="dew"):
+    """
+    Saturation temperature (°C) at one or many pressures (kPa).
+
+    Args:
+        refrigerant (str): e.g. 'R404A', 'R448A', 'R744'
+        pressures (float or iterable): Absolute pressures (kPa).
+        point (str): 'dew' or 'bubble'
+
+    Returns:
+        float or list: Temperature(s) in °C, matching the shape of the input.
+    """
+    table = get_saturation_table(refrigerant)
+    inv_t, ln_p = table["inv_t"], table[point]
+    values, scalar = _as_list(pressures)
+
+    temperatures = []
+    for p in values:
+        y = math.log(p)
+        i = _segment(ln_p, y, refrigerant)
+        x = inv_t[i] + (y - ln_p[i]) * (inv_t[i + 1] - inv_t[i]) / (ln_p[i + 1] - ln_p[i])
+        temperatures.append(1 / x - 273.15)
+    return temperatures[0] if scalar else temperatures
+
+
+def temperature_glide(refrigerant, temperatures):
+    """
+    Temperature glide (K) of a refrigerant at the pressure whose bubble point is each temperature.
+
+    Returns 0 for pure fluids and azeotropes.
+    """
+    values, scalar = _as_list(temperatures)
+    pressures = saturation_pressure(refrigerant, values, point="bubble")
+    glides = [dew - t for dew, t in zip(saturation_temperature(refrigerant, pressures, point="dew"), values)]
+    return glides[0] if scalar else glides
+
+
+def volumetric_latent_heat(refrigerant, temperatures):
+    """
+    Estimated volumetric latent heat (kJ/m³) of saturated vapor at the dew temperature(s).
+
+    Uses Clausius-Clapeyron with ideal-gas vapor: rho_v * h_fg = P * B / T,
+    where B = -d ln(P) / d(1/T) is taken from the table segment. The gas
+    constant cancels, so no molar mass is needed. Good for ratios between
+    refrigerants (compressor displacement scales with it), not absolute sizing.
+    """
+    table = get_saturation_table(refrigerant)
+    grid, inv_t, ln_p = table["temperature"], table["inv_t"], table["dew"]
+    values, scalar = _as_list(temperatures)
+
+    heats = []
+    for t in values:
+        i = _segment(grid, t, refrigerant)
+        slope = -(ln_p[i + 1] - ln_p[i]) / (inv_t[i + 1] - inv_t[i])
+        heats.append(saturation_pressure(refrigerant, t) * slope / (t + 273.15))
+    return heats[0] if scalar else heats
+
+
+@lru_cache(maxsize=None)
+def get_glide_shift(refrigerant, saturation_temp):
+    """
+    Shift (K) of the dew-point saturation temperature relative to the baseline refrigerant.
+
+    The template SST/SCT values describe the baseline refrigerant. Holding
+    the mean evaporating/condensing temperature constant, a blend with more
+    glide needs a dew point higher by half the extra glide.
+    """
+    if refrigerant == BASELINE_REFRIGERANT:
+        return 0.0
+    return (temperature_glide(refrigerant, saturation_temp) - temperature_glide(BASELINE_REFRIGERANT, saturation_temp)) / 2
+
+
+@lru_cache(maxsize=None)
+def get_capacity_ratio(refrigerant, suction_temp):
+    """Compressor capacity of a refrigerant relative to the baseline at the same SST (same displacement)."""
+    if refrigerant == BASELINE_REFRIGERANT:
+        return 1.0
+    return volumetric_latent_heat(refrigerant, suction_temp) / volumetric_latent_heat(BASELINE_REFRIGERANT, suction_temp)
@@ -0,0 +1,169 @@
+import json
+import re
+import sqlite3
+import time
+
+RESULTS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    store_id TEXT NOT NULL,
+    template TEXT,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS racks (
+    run_id INTEGER NOT NULL REFERENCES runs (run_id),
+    operation_type TEXT NOT NULL,
+    rack_number INTEGER NOT NULL,
+    rack_load REAL NOT NULL,
+    unit_count INTEGER NOT NULL,
+    PRIMARY KEY (run_id, operation_type, rack_number)
+);
+CREATE TABLE IF NOT EXISTS rack_units (
+    run_id INTEGER NOT NULL REFERENCES runs (run_id),
+    operation_type TEXT NOT NULL,
+    rack_number INTEGER NOT NULL,
+    unit_name TEXT NOT NULL,
+    capacity REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS compressor_assignments (
+    run_id INTEGER NOT NULL REFERENCES runs (run_id),
+    operation_type TEXT NOT NULL,
+    rack_number INTEGER NOT NULL,
+    rack_load REAL NOT NULL,
+    compressors_needed INTEGER NOT NULL,
+    PRIMARY KEY (run_id, operation_type, rack_number)
+);
+CREATE TABLE IF NOT EXISTS condensers (
+    run_id INTEGER NOT NULL REFERENCES runs (run_id),
+    name TEXT NOT NULL,
+    operation_type TEXT,
+    rack_number INTEGER,
+    heat_rejection REAL,
+    fan_power REAL,
+    minimum_condensing_temperature REAL
+);
+CREATE TABLE IF NOT EXISTS system_objects (
+    run_id INTEGER NOT NULL REFERENCES runs (run_id),
+    object_type TEXT NOT NULL,
+    name TEXT NOT NULL,
+    object_json TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_store ON runs (store_id);
+CREATE INDEX IF NOT EXISTS idx_runs_template ON runs (template);
+CREATE INDEX IF NOT EXISTS idx_rack_units_run ON rack_units (run_id, operation_type, rack_number);
+CREATE INDEX IF NOT EXISTS idx_rack_units_name ON rack_units (unit_name);
+CREATE INDEX IF NOT EXISTS idx_condensers_run ON condensers (run_id);
+CREATE INDEX IF NOT EXISTS idx_system_objects_run ON system_objects (run_id, object_type);
+"""
+
+
+def connect_results_store(results_db_path, timeout=30.0):
+    """
+    Open (and create if needed) a results store in WAL mode.
+
+    WAL lets analysts read while parallel workers append; `timeout` is how
+    long a writer waits for another writer's transaction to finish.
+    """
+    conn = sqlite3.connect(results_db_path, timeout=timeout, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(RESULTS_SCHEMA)
+    return conn
+
+
+def write_run_results(
+    results_db_path,
+    store_id,
+    template,
+    mt_racks,
+    lt_racks,
+    mt_info,
+    lt_info,
+    condensers=(),
+    system_objects=()
+):
+    """
+    Store one run's racks, compressor assignments, condensers and system objects.
+
+    All rows of a run are written in a single transaction with batched
+    `executemany` inserts. Earlier runs of the same store_id are deleted in
+    that transaction, so a retried scenario is never counted twice.
+
+    Args:
+        results_db_path (str): Path to the results SQLite file.
+        store_id (str): Store or scenario identifier.
+        template (str): 'old', 'new', or 'advanced'
+        mt_racks, lt_racks (list): Racks from `assign_racks_to_cases_and_walkins`.
+        mt_info, lt_info (list): From `calculate_compressors_for_racks`.
+        condensers (list): OS:Refrigeration:Condenser:AirCooled objects.
+        system_objects (list): Objects from `generate_system_and_casewalkin_lists`.
+
+    Returns:
+        int: The new run_id.
+    """
+    rack_rows = []
+    unit_rows = []
+    for operation_type, racks in (("MT", mt_racks), ("LT", lt_racks)):
+        for rack_number, rack in enumerate(racks, 1):
+            rack_rows.append((operation_type, rack_number, sum(item['capacity'] for item in rack), len(rack)))
+            unit_rows.extend((operation_type, rack_number, item['name'], item['capacity']) for item in rack)
+
+    compressor_rows = [
+        (operation_type, info['rack_number'], info['rack_load'], info['compressors_needed'])
+        for operation_type, infos in (("MT", mt_info), ("LT", lt_info))
+        for info in infos
+    ]
+
+    condenser_rows = []
+    for condenser in condensers:
+        match = re.match(r"(MT|LT)_Rack(\d+)_Condenser", condenser["name"])
+        condenser_rows.append((
+            condenser["name"],
+            match.group(1) if match else None,
+            int(match.group(2)) if match else None,
+            condenser.get("RatedEffectiveTotalHeatRejectionRate"),
+            condenser.get("FanPower"),
+            condenser.get("MinimumCondensingTemperature")
+        ))
+
+    object_rows = [(obj["type"], obj["name"], json.dumps(obj)) for obj in system_objects]
+
+    conn = connect_results_store(results_db_path)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            old_run_ids = [(row[0],) for row in conn.execute("SELECT run_id FROM runs WHERE store_id = ?", (str(store_id),))]
+            for table in ("racks", "rack_units", "compressor_assignments", "condensers", "system_objects", "runs"):
+                conn.executemany(f"DELETE FROM {table} WHERE run_id = ?", old_run_ids)
+            run_id = conn.execute(
+                "INSERT INTO runs (store_id, template, created_at) VALUES (?, ?, ?)",
+                (str(store_id), template, time.time())
+            ).lastrowid
+            conn.executemany(
+                "INSERT INTO racks (run_id, operation_type, rack_number, rack_load, unit_count) VALUES (?, ?, ?, ?, ?)",
+                [(run_id, *row) for row in rack_rows]
+            )
+            conn.executemany(
+                "INSERT INTO rack_units (run_id, operation_type, rack_number, unit_name, capacity) VALUES (?, ?, ?, ?, ?)",
+                [(run_id, *row) for row in unit_rows]
+            )
+            conn.executemany(
+                "INSERT INTO compressor_assignments (run_id, operation_type, rack_number, rack_load, compressors_needed) VALUES (?, ?, ?, ?, ?)",
+                [(run_id, *row) for row in compressor_rows]
+            )
+            conn.executemany(
+                "INSERT INTO condensers (run_id, name, operation_type, rack_number, heat_rejection, fan_power, minimum_condensing_temperature) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(run_id, *row) for row in condenser_rows]
+            )
+            conn.executemany(
+                "INSERT INTO system_objects (run_id, object_type, name, object_json) VALUES (?, ?, ?, ?)",
+                [(run_id, *row) for row in object_rows]
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    finally:
+        conn.close()
+
+    return run_id
@@ -0,0 +1,120 @@
+import csv
+import json
+from .db_utils import get_data_from_counts
+from .rack_assignment import get_rack_capacity_limits, assign_racks_from_data
+
+VALID_TEMPLATES = ("old", "new", "advanced")
+WALKIN_SYSTEM_TYPES = ("walkin", "walk-in", "walk_in")
+
+
+def normalize_unit_name(name, template=None):
+    """
+    Normalize a unit name to the lowercase catalog key used by the DB lookup.
+
+    Surrounding and repeated whitespace is collapsed. When a template is given
+    and the name does not already start with it, the template prefix is added
+    (e.g. "LT Coffin - Ice Cream" -> "new lt coffin - ice cream").
+    """
+    key = " ".join(name.split()).lower()
+    if template and not key.startswith(f"{template.lower()} "):
+        key = f"{template.lower()} {key}"
+    return key
+
+
+def iter_unit_rows_csv(path):
+    """
+    Yield (system_type, name, number_of_units, template) rows from a CSV file.
+
+    Expected columns: system_type ('case' or 'walkin'), name,
+    number_of_units (optional, default 1) and template (optional).
+    """
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            yield (
+                row["system_type"],
+                row["name"],
+                int(float(row.get("number_of_units") or 1)),
+                row.get("template") or None
+            )
+
+
+def iter_unit_rows_jsonl(path):
+    """Yield (system_type, name, number_of_units, template) rows from a JSON Lines file."""
+    with open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            yield (
+                row["system_type"],
+                row["name"],
+                int(row.get("number_of_units", 1)),
+                row.get("template")
+            )
+
+
+def iter_unit_rows(path):
+    """Yield unit rows from a .csv or .jsonl file."""
+    if path.endswith(".csv"):
+        return iter_unit_rows_csv(path)
+    elif path.endswith(".jsonl"):
+        return iter_unit_rows_jsonl(path)
+    raise ValueError(f"Unsupported unit list format: {path}")
+
+
+def aggregate_unit_counts(rows, template=None):
+    """
+    Aggregate streamed unit rows into per-name counts in a single pass.
+
+    Memory grows with the number of distinct unit names, not with the number
+    of rows.
+
+    Args:
+        rows (iterable): (system_type, name, number_of_units, template) tuples.
+        template (str): Template applied to rows without one.
+
+    Returns:
+        Tuple[dict, dict, str]: (case_counts, walkin_counts, template), counts
+        keyed by normalized name; template is the first one seen.
+    """
+    case_counts = {}
+    walkin_counts = {}
+    detected_template = template.lower() if template else None
+
+    # Line items repeat the same few names, so normalize each distinct spelling once
+    normalized = {}
+    for system_type, name, count, row_template in rows:
+        row_template = row_template or template
+        key = normalized.get((name, row_template))
+        if key is None:
+            key = normalized[(name, row_template)] = normalize_unit_name(name, row_template)
+        if detected_template is None:
+            prefix = key.split(" ", 1)[0]
+            detected_template = prefix if prefix in VALID_TEMPLATES else None
+
+        counts = walkin_counts if system_type.lower() in WALKIN_SYSTEM_TYPES else case_counts
+        counts[key] = counts.get(key, 0) + count
+
+    return case_counts, walkin_counts, detected_template
+
+
+def assign_racks_from_unit_stream(db_path, rows, template=None, default_max_capacity=30000):
+    """
+    Stream unit rows straight into catalog resolution and rack assignment.
+
+    Equivalent to building BuildingUnit objects and calling
+    `assign_racks_to_cases_and_walkins`, without materializing a unit per row.
+
+    Args:
+        db_path (str): Path to the SQLite DB.
+        rows (iterable): Unit rows, e.g. from `iter_unit_rows(path)`.
+        template (str): Template for rows without one (also sets rack limits).
+        default_max_capacity (float): Rack limit when no template is known.
+
+    Returns:
+        Tuple[list, list, dict, dict]: (mt_racks, lt_racks, case_data, walkin_data)
+    """
+    case_counts, walkin_counts, template = aggregate_unit_counts(rows, template)
+    case_data, walkin_data = get_data_from_counts(db_path, case_counts, walkin_counts)
+    max_mt_capacity, max_lt_capacity = get_rack_capacity_limits(template, default_max_capacity)
+    return assign_racks_from_data(case_data, walkin_data, max_mt_capacity, max_lt_capacity)
@@ -25,14 +25,20 @@ def generate_system_and_casewalkin_lists(
     name_map = {u.case_name: u.osm_name for u in selected_case_units}
     name_map.update({u.walkin_name: u.osm_name for u in selected_walkin_units})
 
+    def osm_name(item):
+        # Chunks split off by assign_racks_multi_constraint, named as in case_walkin_objects
+        if "split_from" in item:
+            return f"{name_map.get(item['split_from'], item['split_from'])} {item['split_suffix']}"
+        return name_map.get(item["name"], item["name"])
+
     system_objects = []
     rack_id_gen = count(1)
 
     def create_objects_for_rack(rack, rack_type):
         rack_number = next(rack_id_gen)
-        case_and_walkin_names = [name_map.get(item["name"], item["name"]) for item in rack]
-        suction_temp = get_suction_temp(selected_template, rack_type)
-        min_cond_temp = get_min_condensing_temp(selected_template, rack_type)
+        case_and_walkin_names = [osm_name(item) for item in rack]
+        suction_temp = get_suction_temp(selected_template, rack_type, refrigerant)
+        min_cond_temp = get_min_condensing_temp(selected_template, rack_type, refrigerant)
 
         system_name = f"{system_name_prefix} {rack_type} {rack_number}"
         list_name = f"{system_name}_CaseWalkinList"
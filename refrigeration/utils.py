@@ -1,4 +1,4 @@
-import sqlite3
+from .refrigerant import get_saturation_table, get_glide_shift
 # define the building type (SuperMarket or User Defined System)
 def get_building_name():
     mode = globals().get("mode", "user").lower()
@@ -7,37 +7,58 @@ def get_building_name():
 
 
 # get SST (Saturated Suction Temperature)
-def get_suction_temp(template, operation_type):
+def get_suction_temp(template, operation_type, refrigerant=None):
     """
     Return SST (Suction Temperature) for given template and operation type.
     These values are fixed regardless of template as per latest specification.
+    When a refrigerant is given, the dew-point SST is shifted for its glide
+    relative to R404A (see refrigerant.get_glide_shift).
     """
     if operation_type == "MT":
-        return -6.6667
+        suction_temp = -6.6667
     elif operation_type == "LT":
-        return -31.67
+        suction_temp = -31.67
     else:
         raise ValueError(f"Invalid operation type: {operation_type}")
+
+    if refrigerant:
+        suction_temp = round(suction_temp + get_glide_shift(refrigerant, suction_temp), 4)
+    return suction_temp
     
 # get SCT (Saturated Condensing Temperature)
-def get_min_condensing_temp(template, operation_type):
+def get_min_condensing_temp(template, operation_type, refrigerant=None):
     """
     Return SCT (Minimum Condensing Temperature) for given template and operation type.
     These values are fixed regardless of template as per latest specification.
+    When a refrigerant is given, the dew-point SCT is shifted for its glide
+    relative to R404A; refrigerants that cannot condense at this temperature
+    (e.g. R744, transcritical) raise ValueError.
     """
     if operation_type == "MT":
-        return 48.8889
+        condensing_temp = 48.8889
     elif operation_type == "LT":
-        return 40.56
+        condensing_temp = 40.56
     else:
         raise ValueError(f"Invalid operation type: {operation_type}")
 
+    if refrigerant:
+        critical_temp = get_saturation_table(refrigerant)["critical_temperature"]
+        if condensing_temp >= critical_temp:
+            raise ValueError(
+                f"{refrigerant} cannot condense at {condensing_temp} °C (critical temperature {critical_temp} °C); "
+                "transcritical systems are not supported by OS:Refrigeration:System."
+            )
+        condensing_temp = round(condensing_temp + get_glide_shift(refrigerant, condensing_temp), 4)
+    return condensing_temp
+
 def clean_name(name, prefix_to_remove):
     if name.lower().startswith(prefix_to_remove):
         return name[len(prefix_to_remove):]
     return name
 
 def generate_available_units_markdown(db_path):
+    import sqlite3  # only this helper needs the DB; keeps exporter imports light
+
     conn = sqlite3.connect(db_path)
     cur = conn.cursor()
 